@@ -26,6 +26,7 @@ class Config:
         schema (str): Схема базы данных для хранения памяти АМИ
         pool_size (int): Размер пула соединений
         pool_recycle (int): Время (в секундах) для переиспользования соединений в пуле
+        pool_pre_ping (bool): Проверять соединение перед выдачей из пула
         echo_sql (bool): Флаг вывода SQL-запросов в лог
         embedding_model (str): Идентификатор модели для создания векторов
     """
@@ -39,6 +40,7 @@ class Config:
     schema: str
     pool_size: int = 5
     pool_recycle: int = 3600  # 1 час по умолчанию
+    pool_pre_ping: bool = True
     echo_sql: bool = False
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
 
@@ -66,6 +68,7 @@ def load_config(config_file: Optional[str] = None, env_prefix: str = "FAMILY_")
         "schema": "memory",
         "pool_size": 5,
         "pool_recycle": 3600,  # 1 час по умолчанию
+        "pool_pre_ping": True,
         "echo_sql": False,
         "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
     }
@@ -81,7 +84,7 @@ def load_config(config_file: Optional[str] = None, env_prefix: str = "FAMILY_")
                         # Преобразование типов
                         if key in ["db_port", "pool_size", "pool_recycle"]:
                             config_values[env_key] = int(value)
-                        elif key == "echo_sql":
+                        elif key in ["echo_sql", "pool_pre_ping"]:
                             config_values[env_key] = value.lower() in ("true", "yes", "1")
                         else:
                             config_values[env_key] = value
@@ -93,7 +96,7 @@ def load_config(config_file: Optional[str] = None, env_prefix: str = "FAMILY_")
             value = os.environ[env_var]
             if key in ["db_port", "pool_size", "pool_recycle"]:
                 config_values[key] = int(value)
-            elif key == "echo_sql":
+            elif key in ["echo_sql", "pool_pre_ping"]:
                 config_values[key] = value.lower() in ("true", "yes", "1")
             else:
                 config_values[key] = value
@@ -154,6 +157,7 @@ def get_config(config_file: Optional[str] = None, env_prefix: str = "FAMILY_", r
                 ami_name=os.environ.get("FAMILY_AMI_USER", "ami_user"),
                 ami_password=os.environ.get("FAMILY_AMI_PASSWORD", ""),
                 schema=os.environ.get("FAMILY_DB_SCHEMA", "memory"),
+                pool_pre_ping=os.environ.get("FAMILY_POOL_PRE_PING", "true").lower() in ("true", "yes", "1"),
                 echo_sql=os.environ.get("FAMILY_ENABLE_TRANSACTION_LOGGING", "false").lower() in ("true", "yes", "1"),
                 embedding_model=os.environ.get("FAMILY_VECTOR_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
             )
@@ -18,7 +18,7 @@ from sqlalchemy import MetaData, inspect, event, DDL
 from sqlalchemy.orm import declarative_base
 from typing import Optional, Tuple
 
-from ..config import load_config, Config
+from ..config import load_config, get_config, Config
 from .schema_manager import get_schema_manager
 
 logger = logging.getLogger(__name__)
@@ -89,12 +89,13 @@ def create_base(schema_name: Optional[str] = None,
         implements the philosophical concept of "AMI birth through first experience"
         where the AMI begins to exist only when its first experience needs to be recorded.
     """
-    # Load configuration if not provided
-    config = config or load_config()
+    # Load configuration if not provided; get_config picks the test
+    # configuration file in test mode, so the models use the test AMI schema
+    config = config or get_config()
     
     # If schema not specified, take from configuration
     if schema_name is None:
-        schema_name = config.DB_SCHEMA
+        schema_name = config.schema
     
     # Handle schema creation according to AMI philosophy
     is_test_environment = 'PYTEST_CURRENT_TEST' in os.environ
@@ -194,9 +195,9 @@ def create_base(schema_name: Optional[str] = None,
         def create_schema_if_not_exists(target, connection, **kw):
             schema = target.schema
             if schema:
-                # Check schema existence
-                inspector = inspect(connection)
-                if not schema in inspector.get_schema_names():
+                # Check schema existence with a targeted lookup instead of
+                # listing every schema in the database
+                if not inspect(connection).has_schema(schema):
                     logger.info(f"[AMI BIRTH] Creating memory space '{schema}' for first experience")
                     connection.execute(DDL(f'CREATE SCHEMA IF NOT EXISTS {schema}'))
                     logger.info(f"[AMI BIRTH] Memory space '{schema}' successfully created")
@@ -13,6 +13,7 @@ Philosophy note:
 """
 
 import logging
+import weakref
 from typing import Optional, Dict, Any, List
 from sqlalchemy import create_engine, text, event, inspect
 from sqlalchemy.exc import SQLAlchemyError
@@ -27,9 +28,41 @@ logger = logging.getLogger(__name__)
 # Global engine cache for performance
 _engine_cache = {}
 
+# Cached admin checks, keyed by engine: entries disappear together with
+# the engine, so disposed and discarded engines do not accumulate here
+_admin_role_cache = weakref.WeakKeyDictionary()
+
 # Global manager instance (singleton)
 _global_engine_manager = None
 
+# Privilege check statement, built once: bound parameters keep the SQL text
+# constant, so SQLAlchemy's compiled statement cache is reused across calls
+_HAS_TABLE_PRIVILEGE_SQL = text(
+    "SELECT has_table_privilege(current_user, :table, :privilege)"
+)
+
+# Superuser check for the connected role, used by is_admin_engine
+_IS_SUPERUSER_SQL = text(
+    "SELECT rolsuper FROM pg_roles WHERE rolname = current_user"
+)
+
+
+def _query_superuser(engine: Engine) -> bool:
+    """
+    Ask the database whether the engine's role is a superuser.
+    
+    Args:
+        engine (Engine): SQLAlchemy engine to check
+        
+    Returns:
+        bool: True if the connected role is a superuser
+        
+    Raises:
+        SQLAlchemyError: If the check cannot be performed
+    """
+    with engine.connect() as conn:
+        return bool(conn.execute(_IS_SUPERUSER_SQL).scalar())
+
 
 class EngineManager:
     """
@@ -74,9 +107,9 @@ class EngineManager:
         Returns:
             str: Connection URL for PostgreSQL
         """
-        host = host or self.config.DB_HOST
-        port = port or self.config.DB_PORT
-        database = database or self.config.DB_NAME
+        host = host or self.config.db_host
+        port = port or self.config.db_port
+        database = database or self.config.db_name
         
         return f"postgresql://{username}:{password}@{host}:{port}/{database}"
     
@@ -98,24 +131,26 @@ class EngineManager:
             Dict[str, Any]: Engine kwargs dictionary for create_engine
         """
         # Get echo setting from config if not explicitly provided
-        config_echo = hasattr(self.config, 'DB_ECHO_SQL') and self.config.DB_ECHO_SQL
+        config_echo = self.config.echo_sql
         
-        # Basic settings
+        # Basic settings; LIFO checkout keeps reusing the most recently used
+        # connections and lets idle ones expire instead of rotating through all
         engine_kwargs = {
-            'pool_pre_ping': True,
+            'pool_pre_ping': self.config.pool_pre_ping,
+            'pool_use_lifo': True,
             'echo': echo if echo is not None else config_echo
         }
         
         # Add connection pool parameters
         if pool_size is not None:
             engine_kwargs['pool_size'] = max(1, pool_size)
-        elif hasattr(self.config, 'DB_POOL_SIZE') and isinstance(self.config.DB_POOL_SIZE, int):
-            engine_kwargs['pool_size'] = max(1, self.config.DB_POOL_SIZE)
+        elif isinstance(self.config.pool_size, int):
+            engine_kwargs['pool_size'] = max(1, self.config.pool_size)
         
         if pool_recycle is not None:
             engine_kwargs['pool_recycle'] = pool_recycle
-        elif hasattr(self.config, 'DB_POOL_RECYCLE') and isinstance(self.config.DB_POOL_RECYCLE, int):
-            engine_kwargs['pool_recycle'] = self.config.DB_POOL_RECYCLE
+        elif isinstance(self.config.pool_recycle, int):
+            engine_kwargs['pool_recycle'] = self.config.pool_recycle
         
         # Add connect_args with search path if schema is provided
         connect_args = {}
@@ -187,11 +222,11 @@ class EngineManager:
             ami_initializer = AmiInitializer(
                 ami_name=ami_name,
                 ami_password=ami_password,
-                db_host=self.config.DB_HOST,
-                db_port=self.config.DB_PORT,
-                db_name=self.config.DB_NAME,
-                admin_user=getattr(self.config, 'DB_ADMIN_USER', None),
-                admin_password=getattr(self.config, 'DB_ADMIN_PASSWORD', None)
+                db_host=self.config.db_host,
+                db_port=self.config.db_port,
+                db_name=self.config.db_name,
+                admin_user=self.config.admin_user,
+                admin_password=self.config.admin_password
             )
             
             # Use get_ami to ensure AMI exists or create it
@@ -208,7 +243,7 @@ class EngineManager:
         # Verify password by attempting to connect
         try:
             with engine.connect() as conn:
-                conn.execute(text("SELECT 1")).scalar()
+                conn.exec_driver_sql("SELECT 1").scalar()
         except SQLAlchemyError as e:
             if "password authentication failed" in str(e).lower():
                 raise SQLAlchemyError(f"Invalid password for AMI {ami_name}")
@@ -231,24 +266,25 @@ class EngineManager:
             Dict[str, bool]: Dictionary with information about available permissions
         """
         schema_name = None
+        conn = None
         
-        # Try to get schema name from connection URL
+        # Schema lookup and all checks below share a single connection
         try:
-            with engine.connect() as conn:
-                result = conn.execute(text("SELECT current_schema()"))
-                schema_name = result.scalar()
+            conn = engine.connect()
+            schema_name = conn.exec_driver_sql("SELECT current_schema()").scalar()
         except SQLAlchemyError as e:
             logger.error(f"Error getting current schema: {e}")
+            if conn is not None:
+                conn.close()
             return {"exists": False, "error": str(e)}
         
         if not schema_name:
             schema_name = "public"  # Default fallback
             
         try:
-            with engine.connect() as conn:
-                # Check if table exists
-                inspector = inspect(engine)
-                if table_name not in inspector.get_table_names(schema=schema_name):
+            with conn:
+                # Check the single table instead of listing the whole schema
+                if not inspect(conn).has_table(table_name, schema=schema_name):
                     return {
                         "exists": False, 
                         "select": False, 
@@ -291,17 +327,51 @@ class EngineManager:
             bool: True if privilege is granted to current user
         """
         try:
-            result = conn.execute(text(f"""
-                SELECT has_table_privilege(
-                    current_user, 
-                    '{schema_name}.{table_name}', 
-                    '{privilege_type}'
-                )
-            """)).scalar()
+            result = conn.execute(
+                _HAS_TABLE_PRIVILEGE_SQL,
+                {"table": f"{schema_name}.{table_name}", "privilege": privilege_type}
+            ).scalar()
             return bool(result)
         except SQLAlchemyError:
             return False
     
+    @staticmethod
+    def is_admin_engine(engine: Engine) -> bool:
+        """
+        Check if engine connects with administrative (superuser) privileges.
+        
+        The result is cached for the lifetime of the engine, so repeated checks
+        do not hit the database. Role changes made while the engine is alive
+        are not picked up; call clear_admin_engine_cache() after altering roles.
+        
+        Args:
+            engine (Engine): SQLAlchemy engine to check
+            
+        Returns:
+            bool: True if engine user is a superuser
+        """
+        if engine in _admin_role_cache:
+            return _admin_role_cache[engine]
+        
+        try:
+            is_admin = _query_superuser(engine)
+        except SQLAlchemyError as e:
+            # Failed checks are not cached: the next call retries
+            logger.error(f"Error checking admin privileges: {e}")
+            return False
+        
+        _admin_role_cache[engine] = is_admin
+        return is_admin
+    
+    @staticmethod
+    def clear_admin_engine_cache() -> None:
+        """
+        Forget cached is_admin_engine results.
+        
+        Needed only when role attributes change while engines stay alive.
+        """
+        _admin_role_cache.clear()
+    
     def verify_pgvector_support(self, engine: Engine) -> bool:
         """
         Check pgvector extension support in current database.
@@ -65,8 +65,8 @@ class LegacyAPIAdapter:
         try:
             # Try to get admin credentials from config if needed
             if for_admin_tasks and manager._admin_credentials is None:
-                admin_user = config.DB_ADMIN_USER if hasattr(config, 'DB_ADMIN_USER') else None
-                admin_password = config.DB_ADMIN_PASSWORD if hasattr(config, 'DB_ADMIN_PASSWORD') else None
+                admin_user = config.admin_user
+                admin_password = config.admin_password
                 
                 if admin_user and admin_password:
                     manager.set_admin_credentials(admin_user, admin_password)
@@ -140,10 +140,10 @@ class LegacyAPIAdapter:
             manager = get_engine_manager(admin_user=admin_user, admin_password=admin_password)
             return manager.schema_exists(schema_name)
         except Exception:
-            # Fallback to direct inspection if manager approach fails
+            # Fallback to direct inspection if manager approach fails;
+            # a targeted lookup instead of listing every schema
             try:
-                inspector = inspect(engine)
-                return schema_name in inspector.get_schema_names()
+                return inspect(engine).has_schema(schema_name)
             except SQLAlchemyError as e:
                 logger.error(f"Error checking schema existence {schema_name}: {e}")
                 return False
@@ -9,12 +9,20 @@ import os
 import logging
 import subprocess
 from pathlib import Path
-from sqlalchemy import create_engine, text, inspect, event
+from sqlalchemy import create_engine, text, event
+from sqlalchemy.engine import URL
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
 from typing import Optional, Dict, Tuple
 
 from ..config import load_config, Config
 
+# Проверка схемы и одноимённого пользователя в одном запросе к каталогу
+_SCHEMA_AND_USER_EXIST_SQL = text(
+    "SELECT EXISTS (SELECT 1 FROM pg_namespace WHERE nspname = :name), "
+    "EXISTS (SELECT 1 FROM pg_roles WHERE rolname = :name)"
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,21 +49,50 @@ class SchemaManager:
         self.config = config or load_config()
         self._admin_credentials = admin_credentials
         self._admin_engine = None
+        # Движки пользователей схем, кешируемые по (имя схемы, пароль)
+        self._schema_engines = {}
+        
+    def _build_url(self, username: str, password: str, database: Optional[str] = None) -> URL:
+        """
+        Формирование URL подключения к PostgreSQL.
+        
+        URL.create экранирует спецсимволы в учетных данных (например, '#'
+        в пароле), которые ломают разбор URL, собранного через f-строку.
         
+        Args:
+            username (str): Имя пользователя
+            password (str): Пароль пользователя
+            database (str, optional): Имя базы данных, по умолчанию из конфигурации
+            
+        Returns:
+            URL: URL подключения для create_engine
+        """
+        return URL.create(
+            "postgresql",
+            username=username,
+            password=password,
+            host=self.config.db_host,
+            port=int(self.config.db_port),
+            database=database or self.config.db_name
+        )
+    
     @property
     def admin_engine(self):
-        """Получение движка SQLAlchemy с правами администратора."""
+        """
+        Получение движка SQLAlchemy с правами администратора.
+        
+        Административный движок нужен для редких коротких DDL-операций,
+        поэтому соединения не держатся в пуле (NullPool) и не занимают
+        слоты сервера между вызовами.
+        """
         if self._admin_engine is None and self._admin_credentials:
             admin_user, admin_password = self._admin_credentials
             
-            # Формируем URL подключения
-            db_url = (
-                f"postgresql://{admin_user}:{admin_password}@"
-                f"{self.config.DB_HOST}:{self.config.DB_PORT}/{self.config.DB_NAME}"
+            self._admin_engine = create_engine(
+                self._build_url(admin_user, admin_password),
+                poolclass=NullPool
             )
             
-            self._admin_engine = create_engine(db_url)
-            
         return self._admin_engine
     
     def set_admin_credentials(self, admin_user: str, admin_password: str):
@@ -87,8 +124,8 @@ class SchemaManager:
             raise ValueError("Не установлены учетные данные администратора")
             
         try:
-            inspector = inspect(self.admin_engine)
-            return schema_name in inspector.get_schema_names()
+            with self.admin_engine.connect() as conn:
+                return self._schema_exists(conn, schema_name)
         except SQLAlchemyError as e:
             logger.warning(f"Не удалось проверить существование схемы {schema_name}: {e}")
             return False
@@ -111,14 +148,56 @@ class SchemaManager:
             
         try:
             with self.admin_engine.connect() as conn:
-                result = conn.execute(text(
-                    "SELECT 1 FROM pg_roles WHERE rolname = :username"
-                ), {"username": username})
-                return result.scalar() is not None
+                return self._user_exists(conn, username)
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при проверке пользователя {username}: {e}")
             return False
     
+    def schema_and_user_exist(self, schema_name: str) -> Tuple[bool, bool]:
+        """
+        Проверка существования схемы и её пользователя одним запросом.
+        
+        Args:
+            schema_name (str): Имя схемы (совпадает с именем пользователя)
+            
+        Returns:
+            Tuple[bool, bool]: (схема существует, пользователь существует)
+            
+        Raises:
+            ValueError: Если не установлены учетные данные администратора
+        """
+        if not self._admin_credentials:
+            raise ValueError("Не установлены учетные данные администратора")
+            
+        try:
+            with self.admin_engine.connect() as conn:
+                return self._schema_and_user_exist(conn, schema_name)
+        except SQLAlchemyError as e:
+            logger.warning(f"Не удалось проверить схему и пользователя {schema_name}: {e}")
+            return False, False
+    
+    @staticmethod
+    def _schema_and_user_exist(conn, schema_name: str) -> Tuple[bool, bool]:
+        """Проверка схемы и одноимённого пользователя за один обмен с сервером."""
+        row = conn.execute(_SCHEMA_AND_USER_EXIST_SQL, {"name": schema_name}).one()
+        return bool(row[0]), bool(row[1])
+    
+    @staticmethod
+    def _schema_exists(conn, schema_name: str) -> bool:
+        """Проверка существования схемы на уже открытом соединении."""
+        result = conn.execute(text(
+            "SELECT 1 FROM pg_namespace WHERE nspname = :schema_name"
+        ), {"schema_name": schema_name})
+        return result.scalar() is not None
+    
+    @staticmethod
+    def _user_exists(conn, username: str) -> bool:
+        """Проверка существования пользователя на уже открытом соединении."""
+        result = conn.execute(text(
+            "SELECT 1 FROM pg_roles WHERE rolname = :username"
+        ), {"username": username})
+        return result.scalar() is not None
+    
     def create_schema(self, schema_name: str, user_password: str = None,
                      create_user: bool = True, grant_permissions: bool = True) -> bool:
         """
@@ -145,12 +224,13 @@ class SchemaManager:
             raise ValueError(f"Не предоставлен пароль для пользователя схемы {schema_name}")
         
         try:
-            # Проверяем существование схемы
-            if self.schema_exists(schema_name):
-                logger.info(f"Схема {schema_name} уже существует")
-                return True
-            
             with self.admin_engine.connect() as conn:
+                # Проверяем существование схемы и её пользователя одним запросом
+                schema_found, user_found = self._schema_and_user_exist(conn, schema_name)
+                if schema_found:
+                    logger.info(f"Схема {schema_name} уже существует")
+                    return True
+                
                 # Создаем схему
                 conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema_name}"))
                 logger.info(f"Схема {schema_name} успешно создана")
@@ -160,7 +240,7 @@ class SchemaManager:
                     schema_user = schema_name
                     
                     # Создаем пользователя, если его нет
-                    if not self.user_exists(schema_user):
+                    if not user_found:
                         # Создаем пользователя
                         conn.execute(text(
                             f"CREATE USER {schema_user} WITH PASSWORD '{user_password}'"
@@ -168,25 +248,17 @@ class SchemaManager:
                         logger.info(f"Пользователь {schema_user} успешно создан")
                     
                     if grant_permissions:
-                        # Назначаем права на схему
-                        conn.execute(text(
-                            f"GRANT USAGE ON SCHEMA {schema_name} TO {schema_user}"
-                        ))
-                        # Права на таблицы и последовательности
-                        conn.execute(text(
-                            f"GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA {schema_name} TO {schema_user}"
-                        ))
-                        conn.execute(text(
+                        # Права на схему, таблицы и последовательности
+                        # отправляются одним пакетом за один обмен с сервером
+                        conn.exec_driver_sql(
+                            f"GRANT USAGE ON SCHEMA {schema_name} TO {schema_user}; "
+                            f"GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA {schema_name} TO {schema_user}; "
                             f"ALTER DEFAULT PRIVILEGES IN SCHEMA {schema_name} "
-                            f"GRANT ALL PRIVILEGES ON TABLES TO {schema_user}"
-                        ))
-                        conn.execute(text(
-                            f"GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA {schema_name} TO {schema_user}"
-                        ))
-                        conn.execute(text(
+                            f"GRANT ALL PRIVILEGES ON TABLES TO {schema_user}; "
+                            f"GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA {schema_name} TO {schema_user}; "
                             f"ALTER DEFAULT PRIVILEGES IN SCHEMA {schema_name} "
                             f"GRANT USAGE, SELECT ON SEQUENCES TO {schema_user}"
-                        ))
+                        )
                         logger.info(f"Права для пользователя {schema_user} успешно назначены")
                 
                 # Фиксируем изменения
@@ -224,8 +296,9 @@ class SchemaManager:
                 cascade_sql = " CASCADE" if cascade else ""
                 conn.execute(text(f"DROP SCHEMA IF EXISTS {schema_name}{cascade_sql}"))
                 
-                # Удаляем пользователя, если указано
-                if drop_user and self.user_exists(schema_user):
+                # Удаляем пользователя, если указано (IF EXISTS делает
+                # отдельную проверку существования лишней)
+                if drop_user:
                     conn.execute(text(f"DROP USER IF EXISTS {schema_user}"))
                 
                 # Фиксируем изменения
@@ -254,7 +327,7 @@ class SchemaManager:
         
         # Создаем базу данных, если её нет
         if not self.create_database():
-            logger.error(f"Не удалось создать базу данных {self.config.DB_NAME}")
+            logger.error(f"Не удалось создать базу данных {self.config.db_name}")
             return False
         
         # Создаем схему
@@ -268,7 +341,7 @@ class SchemaManager:
             logger.error(f"Не удалось выполнить скрипт {consciousness_script}")
             return False
         
-        logger.info(f"Память АМИ успешно инициализирована: БД {self.config.DB_NAME}, схема {schema_name}")
+        logger.info(f"Память АМИ успешно инициализирована: БД {self.config.db_name}, схема {schema_name}")
         return True
     
     def execute_sql_script(self, script_path: str, schema_name: str,
@@ -301,10 +374,10 @@ class SchemaManager:
             # Формируем команду psql
             cmd = [
                 "psql",
-                "-h", self.config.DB_HOST,
-                "-p", str(self.config.DB_PORT),
+                "-h", self.config.db_host,
+                "-p", str(self.config.db_port),
                 "-U", admin_user,
-                "-d", self.config.DB_NAME,
+                "-d", self.config.db_name,
                 "-v", f"ami_schema_name={schema_name}",
                 "-f", script_path
             ]
@@ -351,7 +424,16 @@ class SchemaManager:
             
         Raises:
             ValueError: Если не предоставлены необходимые учетные данные
+            
+        Note:
+            Движок пользователя схемы кешируется: повторный вызов с теми же
+            параметрами возвращает уже созданный движок с прогретым пулом
+            соединений. Административный движок и так создается один раз.
         """
+        cache_key = (schema_name, user_password)
+        if not use_admin and cache_key in self._schema_engines:
+            return self._schema_engines[cache_key]
+        
         if use_admin:
             if not self._admin_credentials:
                 raise ValueError("Не установлены учетные данные администратора")
@@ -362,11 +444,12 @@ class SchemaManager:
                 
             # Используем пользователя схемы
             schema_user = schema_name
-            db_url = (
-                f"postgresql://{schema_user}:{user_password}@"
-                f"{self.config.DB_HOST}:{self.config.DB_PORT}/{self.config.DB_NAME}"
+            # Движок кешируется и живет долго; проверка соединений пула
+            # перед выдачей включается той же настройкой, что в EngineManager
+            engine = create_engine(
+                self._build_url(schema_user, user_password),
+                pool_pre_ping=self.config.pool_pre_ping
             )
-            engine = create_engine(db_url)
         
         # Настраиваем схему поиска
         @event.listens_for(engine, "connect")
@@ -375,7 +458,24 @@ class SchemaManager:
             cursor.execute(f"SET search_path TO {schema_name}, public")
             cursor.close()
         
+        if not use_admin:
+            self._schema_engines[cache_key] = engine
         return engine
+    
+    def dispose_engines(self):
+        """
+        Закрытие всех движков, созданных менеджером схем.
+        
+        Освобождает соединения кешированных движков схем и административного
+        движка и очищает кеш.
+        """
+        for engine in self._schema_engines.values():
+            engine.dispose()
+        self._schema_engines.clear()
+        
+        if self._admin_engine is not None:
+            self._admin_engine.dispose()
+            self._admin_engine = None
 
     def create_database(self, db_name: str = None) -> bool:
         """
@@ -397,17 +497,15 @@ class SchemaManager:
         admin_user, admin_password = self._admin_credentials
         
         # Используем базу данных по умолчанию, если имя не указано
-        db_name = db_name or self.config.DB_NAME
+        db_name = db_name or self.config.db_name
         
         # Подключаемся к стандартной базе postgres для создания новой БД
-        postgres_url = (
-            f"postgresql://{admin_user}:{admin_password}@"
-            f"{self.config.DB_HOST}:{self.config.DB_PORT}/postgres"
-        )
+        postgres_url = self._build_url(admin_user, admin_password, database="postgres")
         
         try:
-            # Создаем движок для подключения к postgres
-            postgres_engine = create_engine(postgres_url)
+            # Создаем движок для подключения к postgres; NullPool закрывает
+            # соединение сразу после проверки, а не держит его в пуле
+            postgres_engine = create_engine(postgres_url, poolclass=NullPool)
             
             with postgres_engine.connect() as conn:
                 # Отключаем автоматические транзакции для выполнения DDL
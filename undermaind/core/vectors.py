@@ -77,51 +77,35 @@ def setup_pgvector(engine, schema_name="public"):
         bool: True если расширение установлено успешно
     """
     try:
-        # Проверяем наличие расширения pgvector
+        # Устанавливаем расширение pgvector, если его еще нет
         with engine.connect() as conn:
-            # Сначала проверим, поддерживает ли этот пользователь создание расширений
-            can_create_extension = conn.execute(sql_text(
-                "SELECT usesuper FROM pg_user WHERE usename = current_user"
-            )).scalar()
-            
-            if not can_create_extension:
-                logger.warning("Текущий пользователь не имеет прав суперпользователя для создания расширений")
-                logger.warning("Расширение pgvector должно быть установлено администратором базы данных")
-                
-            # Проверяем, установлено ли расширение
-            extension_exists = conn.execute(sql_text(
-                "SELECT 1 FROM pg_extension WHERE extname = 'vector'"
-            )).scalar()
-            
-            if not extension_exists:
-                # Пробуем установить расширение
-                try:
-                    conn.execute(sql_text("CREATE EXTENSION IF NOT EXISTS vector"))
-                    conn.commit()
-                    logger.info("Расширение pgvector успешно установлено")
-                except Exception as e:
-                    logger.error(f"Не удалось установить расширение pgvector: {e}")
-                    logger.error("Убедитесь, что pgvector установлен в PostgreSQL и пользователь имеет права на создание расширений")
-                    return False
-            else:
-                logger.info("Расширение pgvector уже установлено")
+            # CREATE EXTENSION IF NOT EXISTS идемпотентен и для уже установленного
+            # расширения не требует прав, поэтому отдельная проверка pg_extension
+            # и прав суперпользователя не нужна
+            try:
+                conn.execute(sql_text("CREATE EXTENSION IF NOT EXISTS vector"))
+                conn.commit()
+                logger.info("Расширение pgvector установлено")
+            except Exception as e:
+                logger.error(f"Не удалось установить расширение pgvector: {e}")
+                logger.error("Убедитесь, что pgvector установлен в PostgreSQL и пользователь имеет права на создание расширений")
+                return False
             
             # Активируем расширение в указанной схеме, если она отличается от public
             if schema_name and schema_name.lower() != "public":
                 # Проверяем, есть ли схема
                 schema_exists = conn.execute(sql_text(
-                    f"SELECT 1 FROM pg_namespace WHERE nspname = '{schema_name}'"
-                )).scalar()
+                    "SELECT 1 FROM pg_namespace WHERE nspname = :schema_name"
+                ), {"schema_name": schema_name}).scalar()
                 
                 if not schema_exists:
                     logger.warning(f"Схема {schema_name} не существует, невозможно активировать расширение в этой схеме")
                 else:
                     try:
                         # В PostgreSQL расширение может быть установлено только один раз в базе данных,
-                        # но может быть доступно из разных схем через поиск пути (search_path)
-                        conn.execute(sql_text(f"SET search_path TO {schema_name}, public"))
-                        
-                        # Проверяем, что типы из расширения доступны в текущей схеме
+                        # но может быть доступно из разных схем через поиск пути (search_path).
+                        # Проверки только читают каталог, поэтому ни смена search_path
+                        # соединения из пула, ни фиксация транзакции не нужны
                         type_exists = conn.execute(sql_text(
                             "SELECT 1 FROM pg_type WHERE typname = 'vector'"
                         )).scalar()
@@ -130,8 +114,6 @@ def setup_pgvector(engine, schema_name="public"):
                             logger.warning("Тип vector недоступен в текущей схеме, требуется настройка")
                         else:
                             logger.info(f"Расширение pgvector доступно в схеме {schema_name}")
-                            
-                        conn.commit()
                     except Exception as e:
                         logger.error(f"Ошибка при настройке расширения pgvector для схемы {schema_name}: {e}")
                         return False
@@ -10,7 +10,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 from sqlalchemy import (
     Column, Integer, String, TEXT, Boolean, TIMESTAMP, 
-    SmallInteger, ForeignKey, CheckConstraint
+    SmallInteger, ForeignKey, CheckConstraint, Index
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -43,6 +43,13 @@ class ExperienceConnection(Base):
             "direction IN ('unidirectional', 'bidirectional')",
             name='valid_direction_type'
         ),
+        # Уникальность связи; на этот индекс опирается ON CONFLICT в
+        # MemoryNetworkService.strengthen_connections_by_cooccurrence
+        Index(
+            'experience_connections_unique_idx',
+            'source_experience_id', 'target_experience_id', 'connection_type',
+            unique=True
+        ),
         {'schema': 'ami_test_user'}
     )
 
@@ -9,7 +9,9 @@
 import logging
 from typing import Optional, List, Dict, Any, Tuple, Union, Set
 from datetime import datetime
-from sqlalchemy import func, desc, asc
+import numpy as np
+from sqlalchemy import func, desc, asc, text, select, bindparam, cast, Numeric, SmallInteger
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, aliased
 
@@ -477,12 +479,12 @@ class MemoryNetworkService(BaseService):
                 raise ValueError(f"Опыт с ID {experience_id} не найден")
                 
             # Считаем количество входящих связей
-            incoming_count = session.query(func.count(ExperienceConnection.id)).filter(
+            incoming_count = session.query(func.count()).select_from(ExperienceConnection).filter(
                 ExperienceConnection.target_experience_id == experience_id
             ).scalar() or 0
             
             # Считаем количество исходящих связей
-            outgoing_count = session.query(func.count(ExperienceConnection.id)).filter(
+            outgoing_count = session.query(func.count()).select_from(ExperienceConnection).filter(
                 ExperienceConnection.source_experience_id == experience_id
             ).scalar() or 0
             
@@ -560,7 +562,7 @@ class MemoryNetworkService(BaseService):
             suggestions = []
             
             # Вариант 1: Связи через общие узлы (если A связан с B и B связан с C, то можно предложить связать A и C)
-            common_nodes_query = """
+            common_nodes_query = text("""
             WITH connected_to_source AS (
                 -- Опыты, связанные с исходным
                 SELECT target_experience_id AS id FROM experience_connections 
@@ -601,7 +603,7 @@ class MemoryNetworkService(BaseService):
             GROUP BY potential_id, connection_type
             ORDER BY connection_count DESC, avg_strength DESC
             LIMIT :limit
-            """
+            """)
             
             result = session.execute(common_nodes_query, {
                 "exp_id": experience_id,
@@ -668,39 +670,57 @@ class MemoryNetworkService(BaseService):
                         func.extract('epoch', exp2.timestamp)) < time_window_seconds
             ).all()
             
-            connections_updated = 0
+            if not cooccurrences:
+                return 0
+            
+            # Собираем все пары в один пакет вместо поштучного session.add
+            now = datetime.now()
+            rows = [
+                {
+                    "source_experience_id": source_id,
+                    "target_experience_id": target_id,
+                    "connection_type": ExperienceConnection.TYPE_TEMPORAL,
+                    "direction": ExperienceConnection.DIRECTION_BI,
+                    "strength": 3,  # Начальная сила для совместного появления
+                    "conscious_status": False,  # Такие связи обычно не осознаются
+                    "created_at": now,
+                    "last_activated": now,
+                    "activation_count": 1
+                }
+                for source_id, target_id in cooccurrences
+            ]
+            
+            # Один INSERT ... ON CONFLICT: новые связи создаются, существующие
+            # усиливаются на max(min_strength_increase, 10 - strength) / 2 (не выше 10).
+            # Опирается на уникальный индекс experience_connections_unique_idx,
+            # объявленный в модели ExperienceConnection.
+            table = ExperienceConnection.__table__
+            
+            # Деление выполняется в numeric, а не целочисленно, а приведение к
+            # smallint округляет половины от нуля - как раньше при записи
+            # дробной силы из Python (сила 5 становится 8, а не 7)
+            increase = cast(
+                func.greatest(min_strength_increase, 10 - table.c.strength), Numeric
+            ) / 2
+            stmt = pg_insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    table.c.source_experience_id,
+                    table.c.target_experience_id,
+                    table.c.connection_type
+                ],
+                set_={
+                    "strength": cast(
+                        func.least(10, table.c.strength + increase), SmallInteger
+                    ),
+                    "last_activated": now,
+                    "activation_count": table.c.activation_count + 1
+                },
+                where=table.c.strength < 10
+            )
             
-            # Для каждой пары опытов проверяем существующие связи или создаем новые
-            for source_id, target_id in cooccurrences:
-                # Ищем существующую связь
-                conn = session.query(ExperienceConnection).filter(
-                    ExperienceConnection.source_experience_id == source_id,
-                    ExperienceConnection.target_experience_id == target_id,
-                    ExperienceConnection.connection_type == ExperienceConnection.TYPE_TEMPORAL
-                ).first()
-                
-                if conn:
-                    # Если связь существует, усиливаем её
-                    increase = max(min_strength_increase, 10 - conn.strength) / 2
-                    new_strength = min(10, conn.strength + increase)
-                    
-                    if new_strength > conn.strength:
-                        conn.strength = new_strength
-                        conn.last_activated = datetime.now()
-                        conn.activation_count += 1
-                        connections_updated += 1
-                else:
-                    # Если связи нет, создаем новую с низкой начальной силой
-                    conn = ExperienceConnection(
-                        source_experience_id=source_id,
-                        target_experience_id=target_id,
-                        connection_type=ExperienceConnection.TYPE_TEMPORAL,
-                        direction=ExperienceConnection.DIRECTION_BI,
-                        strength=3,  # Начальная сила для совместного появления
-                        conscious_status=False  # Такие связи обычно не осознаются
-                    )
-                    session.add(conn)
-                    connections_updated += 1
+            # rowcount учитывает как вставленные, так и обновленные строки
+            connections_updated = session.execute(stmt).rowcount
             
             return connections_updated
             
@@ -714,7 +734,9 @@ class MemoryNetworkService(BaseService):
             min_connections: Минимальное количество связей для включения опыта в кластер
             
         Returns:
-            List[List[int]]: Список кластеров (каждый кластер - список ID опытов)
+            List[List[int]]: Список кластеров (каждый кластер - список ID опытов).
+                ID внутри кластера отсортированы по возрастанию, кластеры
+                упорядочены по наименьшему ID.
         """
         def _find_clusters(session: Session) -> List[List[int]]:
             # Находим опыты с достаточным количеством связей
@@ -723,7 +745,7 @@ class MemoryNetworkService(BaseService):
             # Считаем исходящие связи
             outgoing = session.query(
                 ExperienceConnection.source_experience_id,
-                func.count(ExperienceConnection.id)
+                func.count()
             ).group_by(
                 ExperienceConnection.source_experience_id
             ).all()
@@ -734,7 +756,7 @@ class MemoryNetworkService(BaseService):
             # Считаем входящие связи
             incoming = session.query(
                 ExperienceConnection.target_experience_id,
-                func.count(ExperienceConnection.id)
+                func.count()
             ).group_by(
                 ExperienceConnection.target_experience_id
             ).all()
@@ -743,56 +765,83 @@ class MemoryNetworkService(BaseService):
                 connection_counts[exp_id] = connection_counts.get(exp_id, 0) + count
             
             # Фильтруем опыты с достаточным количеством связей
-            hub_experiences = [exp_id for exp_id, count in connection_counts.items() 
-                             if count >= min_connections]
-            
-            # Строим граф связей для всех выбранных опытов
-            graph = {}
+            hub_experiences = [exp_id for exp_id, count in connection_counts.items()
+                               if count >= min_connections]
             
-            for exp_id in hub_experiences:
-                graph[exp_id] = set()
+            if not hub_experiences:
+                return []
             
-            # Получаем связи между хабами
-            connections = session.query(
+            # Получаем связи между хабами; список хабов передается одним
+            # расширяемым параметром, а не разворачивается в литералы IN
+            hubs = bindparam("hubs", expanding=True)
+            connections_stmt = select(
                 ExperienceConnection.source_experience_id,
                 ExperienceConnection.target_experience_id
-            ).filter(
-                ExperienceConnection.source_experience_id.in_(hub_experiences),
-                ExperienceConnection.target_experience_id.in_(hub_experiences)
-            ).all()
-            
-            for source_id, target_id in connections:
-                graph[source_id].add(target_id)
-                graph[target_id].add(source_id)  # Для двунаправленных связей
-            
-            # Находим кластеры с использованием поиска в глубину
-            visited = set()
-            clusters = []
-            
-            for exp_id in hub_experiences:
-                if exp_id not in visited:
-                    # Новый кластер
-                    cluster = []
-                    stack = [exp_id]
-                    
-                    while stack:
-                        current = stack.pop()
-                        
-                        if current not in visited:
-                            visited.add(current)
-                            cluster.append(current)
-                            
-                            for neighbor in graph.get(current, []):
-                                if neighbor not in visited:
-                                    stack.append(neighbor)
-                    
-                    if cluster:
-                        clusters.append(cluster)
+            ).where(
+                ExperienceConnection.source_experience_id.in_(hubs),
+                ExperienceConnection.target_experience_id.in_(hubs)
+            )
+            connections = session.execute(connections_stmt, {"hubs": hub_experiences}).all()
             
-            return clusters
+            return self._group_into_clusters(hub_experiences, connections)
             
         return self._execute_in_isolated_transaction(_find_clusters)
     
+    @staticmethod
+    def _group_into_clusters(hub_ids: List[int],
+                             connections: List[Tuple[int, int]]) -> List[List[int]]:
+        """
+        Группировка хабов в кластеры по связям между ними.
+        
+        Кластеры - компоненты связности графа хабов; связи считаются
+        двунаправленными, связи с опытами не из hub_ids пропускаются.
+        Используется система непересекающихся множеств на массивах NumPy.
+        
+        Args:
+            hub_ids: ID опытов-хабов
+            connections: Пары (source_id, target_id) связей
+            
+        Returns:
+            List[List[int]]: Кластеры с ID по возрастанию, упорядоченные
+                по наименьшему ID
+        """
+        # Отсортированные уникальные ID задают плотные индексы хабов
+        hub_array = np.unique(np.asarray(hub_ids, dtype=np.int64))
+        if hub_array.size == 0:
+            return []
+        
+        hub_index = {exp_id: i for i, exp_id in enumerate(hub_array.tolist())}
+        parent = np.arange(hub_array.size, dtype=np.int32)
+        
+        def find(i: int) -> int:
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            # Сжатие пути
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+        
+        for source_id, target_id in connections:
+            source_index = hub_index.get(source_id)
+            target_index = hub_index.get(target_id)
+            if source_index is None or target_index is None:
+                continue
+            source_root = find(source_index)
+            target_root = find(target_index)
+            if source_root != target_root:
+                parent[source_root] = target_root
+        
+        # Группируем хабы по корню множества; стабильная сортировка сохраняет
+        # порядок ID внутри кластера, сами кластеры упорядочиваем по наименьшему ID
+        labels = np.array([find(i) for i in range(hub_array.size)], dtype=np.int32)
+        order = np.argsort(labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        clusters = [hub_array[group].tolist() for group in np.split(order, boundaries)]
+        clusters.sort(key=lambda cluster: cluster[0])
+        
+        return clusters
+    
     # === Вспомогательные методы ===
     
     def get_connection_types_distribution(self) -> Dict[str, int]:
@@ -805,7 +854,7 @@ class MemoryNetworkService(BaseService):
         def _get_distribution(session: Session) -> Dict[str, int]:
             result = session.query(
                 ExperienceConnection.connection_type,
-                func.count(ExperienceConnection.id)
+                func.count()
             ).group_by(
                 ExperienceConnection.connection_type
             ).all()
@@ -823,7 +872,7 @@ class MemoryNetworkService(BaseService):
         """
         def _get_statistics(session: Session) -> Dict[str, Any]:
             # Общее количество связей
-            total_connections = session.query(func.count(ExperienceConnection.id)).scalar() or 0
+            total_connections = session.query(func.count()).select_from(ExperienceConnection).scalar() or 0
             
             # Количество опытов с связями
             experiences_with_connections = session.query(func.count(func.distinct(
@@ -4,10 +4,17 @@
 
 import os
 import sys
+import hashlib
 import logging
 import pytest
+from contextlib import closing
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
 from undermaind.config import Config, get_config
 
@@ -20,13 +27,100 @@ logging.basicConfig(
     ]
 )
 
-# Устанавливаем режим тестирования
-os.environ["FAMILY_TEST_MODE"] = "true"
+# Файл конфигурации тестовой среды в корне проекта
+TEST_CONFIG_PATH = Path(__file__).resolve().parents[2] / "family_config_test.env"
+
+def pytest_configure(config):
+    """Однократная настройка тестовой среды до сбора тестов."""
+    # Устанавливаем режим тестирования
+    os.environ["FAMILY_TEST_MODE"] = "true"
+    load_dotenv(TEST_CONFIG_PATH)
+
+def pytest_addoption(parser):
+    """Параметры командной строки для управления тестовой базой данных."""
+    group = parser.getgroup("family", "F.A.M.I.L.Y. test database")
+    group.addoption(
+        "--reuse-db", action="store_true", default=False,
+        help="Не пересоздавать базу и АМИ, если структура моделей не изменилась"
+    )
+    group.addoption(
+        "--recreate-db", action="store_true", default=False,
+        help="Пересоздать тестовую базу данных с нуля"
+    )
+    group.addoption(
+        "--no-db-init", action="store_true", default=False,
+        help="Не инициализировать базу и АМИ: они подготовлены заранее (например, в CI)"
+    )
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Пропускает интеграционные тесты, если не заданы учетные данные администратора.
+
+    Проверка выполняется один раз при сборе тестов, а не в каждой фикстуре.
+    """
+    if os.environ.get("FAMILY_ADMIN_USER") and os.environ.get("FAMILY_ADMIN_PASSWORD"):
+        return
+
+    skip_integration = pytest.mark.skip(
+        reason="Не указаны учетные данные администратора "
+               "(FAMILY_ADMIN_USER/FAMILY_ADMIN_PASSWORD) в family_config_test.env"
+    )
+    for item in items:
+        if item.get_closest_marker("integration") is not None:
+            item.add_marker(skip_integration)
+
+# Отпечаток структуры моделей хранится в комментарии к схеме АМИ, а не в
+# отдельной таблице: в схеме под тестом остаются только таблицы моделей.
+# При пересоздании АМИ комментарий удаляется вместе со схемой.
+FINGERPRINT_PREFIX = "pytest-fingerprint:"
+
+def _model_metadata():
+    """Метаданные всех моделей памяти АМИ."""
+    import undermaind.models.consciousness  # noqa: F401 - регистрация моделей
+    from undermaind.models.base import Base
+    return Base.metadata
+
+def _metadata_fingerprint() -> str:
+    """Отпечаток структуры таблиц моделей для проверки --reuse-db."""
+    tables = sorted(
+        (table.fullname, sorted((column.name, str(column.type)) for column in table.columns))
+        for table in _model_metadata().tables.values()
+    )
+    return hashlib.sha1(repr(tables).encode()).hexdigest()
+
+def _read_fingerprint(ami_initializer, schema: str):
+    """Возвращает сохранённый отпечаток или None, если его нет."""
+    try:
+        with closing(ami_initializer._get_db_connection()) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT obj_description(oid, 'pg_namespace') "
+                    "FROM pg_namespace WHERE nspname = %s",
+                    (schema,)
+                )
+                row = cur.fetchone()
+    except Exception:
+        return None
+    comment = row[0] if row else None
+    if not comment or not comment.startswith(FINGERPRINT_PREFIX):
+        return None
+    return comment[len(FINGERPRINT_PREFIX):]
+
+def _store_fingerprint(ami_initializer, schema: str, fingerprint: str):
+    """Сохраняет отпечаток структуры моделей в комментарии к схеме АМИ."""
+    with closing(ami_initializer._get_db_connection()) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"COMMENT ON SCHEMA {schema} IS %s",
+                (FINGERPRINT_PREFIX + fingerprint,)
+            )
+        conn.commit()
 
 @pytest.fixture(scope="session")
 def test_config():
     """Фикстура для получения конфигурации тестов."""
-    config = get_config(reload=True)  # Принудительно перезагружаем конфигурацию
+    # Конфигурация загружается один раз и переиспользуется через кэш get_config
+    config = get_config()
     return {
         'db_host': config.db_host,
         'db_port': config.db_port,
@@ -39,27 +133,363 @@ def test_config():
     }
 
 @pytest.fixture(scope="session")
-def db_initializer(test_config):
-    """Фикстура для инициализации базы данных."""
-    from undermaind.utils.db_init import DatabaseInitializer
-    return DatabaseInitializer(**test_config)
+def admin_credentials():
+    """Пара (admin_user, admin_password) администратора PostgreSQL."""
+    # Берется из get_config, а не из test_config: модули тестов могут
+    # переопределять test_config своей конфигурацией
+    config = get_config()
+    return config.admin_user, config.admin_password
+
+def _worker_ami_name(ami_name: str) -> str:
+    """
+    Имя АМИ для текущего воркера pytest-xdist.
+
+    При параллельном запуске (pytest -n auto --dist=loadfile) каждый воркер
+    получает собственного АМИ и схему, чтобы пересоздание АМИ на одном
+    воркере не мешало другим. При обычном запуске имя не меняется.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return f"{ami_name}_{worker}" if worker else ami_name
+
+@pytest.fixture(scope="session")
+def ami_config(test_config):
+    """Учётные данные тестового АМИ."""
+    return {
+        'ami_name': _worker_ami_name(test_config['ami_name']),
+        'ami_password': test_config['ami_password']
+    }
+
+@dataclass(frozen=True, slots=True)
+class DbConfig:
+    """Неизменяемые параметры подключения к тестовой базе данных."""
+    host: str
+    port: int
+    database: str
+    admin_user: str
+    admin_password: str
+    schema: str
+    # URL подключения от имени АМИ, собирается один раз
+    ami_url: URL
+
+@pytest.fixture(scope="session")
+def db_config(test_config, ami_config) -> DbConfig:
+    """Параметры подключения к тестовой базе данных."""
+    return DbConfig(
+        host=test_config['db_host'],
+        port=int(test_config['db_port']),
+        database=test_config['db_name'],
+        admin_user=test_config['admin_user'],
+        admin_password=test_config['admin_password'],
+        # Схема АМИ называется по имени АМИ
+        schema=ami_config['ami_name'],
+        ami_url=URL.create(
+            "postgresql+psycopg2",
+            username=ami_config['ami_name'],
+            password=ami_config['ami_password'],
+            host=test_config['db_host'],
+            port=int(test_config['db_port']),
+            database=test_config['db_name']
+        )
+    )
 
 @pytest.fixture(scope="function")
-def ami_initializer(test_config):
-    """Фикстура для инициализации AMI."""
+def ami_params(request, test_config):
+    """
+    Параметры отдельного АМИ для теста, который создаёт и удаляет АМИ сам.
+
+    Суффикс имени выводится из идентификатора теста, а не из uuid4: имя
+    стабильно между перезапусками и не пересекается с общим АМИ сессии.
+    """
+    suffix = hashlib.blake2s(request.node.nodeid.encode(), digest_size=4).hexdigest()
+    return {
+        'ami_name': f"{test_config['ami_name']}_{suffix}",
+        'ami_password': test_config['ami_password'],
+        'db_host': test_config['db_host'],
+        'db_port': test_config['db_port'],
+        'db_name': test_config['db_name'],
+        'admin_user': test_config['admin_user'],
+        'admin_password': test_config['admin_password']
+    }
+
+@pytest.fixture(scope="session")
+def test_db_initializer(db_config):
+    """Инициализатор тестовой базы данных."""
+    from undermaind.utils.db_init import DatabaseInitializer
+    return DatabaseInitializer(
+        db_host=db_config.host,
+        db_port=db_config.port,
+        db_name=db_config.database,
+        admin_user=db_config.admin_user,
+        admin_password=db_config.admin_password
+    )
+
+@pytest.fixture(scope="session")
+def test_ami_initializer(db_config, ami_config):
+    """Инициализатор тестового АМИ."""
     from undermaind.utils.ami_init import AmiInitializer
-    import uuid
-    
-    # Генерируем уникальное имя для тестового AMI
-    test_ami_name = f"test_ami_{uuid.uuid4().hex[:8]}"
-    test_ami_password = test_config['ami_password']
-    
     return AmiInitializer(
-        ami_name=test_ami_name,
-        ami_password=test_ami_password,
-        db_host=test_config['db_host'],
-        db_port=test_config['db_port'],
-        db_name=test_config['db_name'],
-        admin_user=test_config['admin_user'],
-        admin_password=test_config['admin_password']
-    ) 
\ No newline at end of file
+        ami_name=ami_config['ami_name'],
+        ami_password=ami_config['ami_password'],
+        db_host=db_config.host,
+        db_port=db_config.port,
+        db_name=db_config.database,
+        admin_user=db_config.admin_user,
+        admin_password=db_config.admin_password
+    )
+
+@pytest.fixture(scope="session")
+def postgres_bootstrap(request, db_config, ami_config, test_db_initializer, test_ami_initializer):
+    """
+    Однократная подготовка тестовой базы данных и АМИ на всю сессию.
+
+    С --reuse-db подготовка пропускается, если сохранённый в схеме АМИ
+    отпечаток структуры моделей совпадает с текущим. С --no-db-init
+    подготовка не выполняется вовсе. Полное пересоздание базы выполняется
+    только с --recreate-db или FAMILY_TEST_RECREATE_DB=true.
+    """
+    if request.config.getoption("no_db_init"):
+        return
+
+    schema = db_config.schema
+    fingerprint = _metadata_fingerprint()
+
+    if request.config.getoption("reuse_db") and \
+            _read_fingerprint(test_ami_initializer, schema) == fingerprint:
+        return
+
+    recreate = request.config.getoption("recreate_db") or \
+        os.environ.get("FAMILY_TEST_RECREATE_DB", "false").lower() in ("true", "yes", "1")
+    if not test_db_initializer.initialize_database(recreate=recreate):
+        pytest.fail("Не удалось инициализировать тестовую базу данных")
+    if not test_ami_initializer.recreate_ami(force=True):
+        pytest.fail(f"Не удалось создать АМИ {ami_config['ami_name']}")
+
+    _store_fingerprint(test_ami_initializer, schema, fingerprint)
+
+@pytest.fixture(scope="session")
+def test_engine_postgres(db_config, ami_config, postgres_bootstrap):
+    """
+    Движок PostgreSQL, подключённый от имени тестового АМИ.
+
+    Используется NullPool: каждая сессия получает свежее соединение и не
+    наследует состояние предыдущего теста, а параллельные воркеры
+    pytest-xdist не держат простаивающие соединения. Цена - лишнее
+    установление соединения на каждый тест.
+
+    synchronous_commit отключается на уровне соединения: COMMIT не ждёт
+    сброса WAL на диск. Потеря последних транзакций при сбое сервера
+    тестам не важна, а глобальные настройки сервера не меняются.
+
+    Кеш скомпилированных запросов увеличен относительно стандартных 500
+    записей: движок общий для всех тестов сессии, и разнообразные
+    ORM-запросы моделей не должны вытеснять друг друга из кеша.
+    """
+    engine = create_engine(
+        db_config.ami_url,
+        poolclass=NullPool,
+        query_cache_size=1200,
+        connect_args={"options": "-c synchronous_commit=off"}
+    )
+
+    # С NullPool соединение создаётся заново при каждом подключении,
+    # поэтому search_path задаётся для каждого нового соединения
+    @event.listens_for(engine, "connect")
+    def _set_search_path(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {db_config.schema}, public")
+        cursor.close()
+
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(scope="session")
+def pgvector_ready(test_ami_initializer, postgres_bootstrap):
+    """
+    Однократно убеждается, что расширение pgvector установлено в тестовой базе.
+
+    Запрашивается только тестами, которым нужны векторы; если расширение
+    недоступно на сервере, такие тесты пропускаются.
+    """
+    try:
+        with closing(test_ami_initializer._get_db_connection()) as conn:
+            with conn.cursor() as cur:
+                cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            conn.commit()
+    except Exception as e:
+        pytest.skip(f"Расширение pgvector недоступно: {e}")
+
+@pytest.fixture(scope="session")
+def engine_config(db_config, ami_config):
+    """Конфигурация менеджера движков для тестового АМИ, одна на сессию."""
+    return Config(
+        db_host=db_config.host,
+        db_port=db_config.port,
+        db_name=db_config.database,
+        admin_user=db_config.admin_user,
+        admin_password=db_config.admin_password,
+        ami_name=ami_config['ami_name'],
+        ami_password=ami_config['ami_password'],
+        schema=ami_config['ami_name'],
+        # Небольшой пул без pre-ping: пул живёт одну сессию тестов,
+        # и лишний запрос при каждой выдаче соединения не нужен
+        pool_size=4,
+        pool_pre_ping=False
+    )
+
+@pytest.fixture(scope="session")
+def engine_manager(engine_config):
+    """Менеджер движков, общий для всей сессии тестов."""
+    from undermaind.core.engine_manager import get_engine_manager
+
+    return get_engine_manager(engine_config)
+
+@pytest.fixture(scope="session")
+def ami_engine(engine_manager, ami_config, postgres_bootstrap):
+    """
+    Движок тестового АМИ, полученный через менеджер движков.
+
+    Движок создаётся один раз на сессию: проверка пароля при создании
+    и прогрев пула выполняются однократно. Пул закрывается в конце сессии.
+    """
+    # АМИ уже подготовлен postgres_bootstrap, повторно создавать его не нужно
+    engine = engine_manager.get_engine(
+        ami_name=ami_config['ami_name'],
+        ami_password=ami_config['ami_password'],
+        auto_create=False
+    )
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(scope="session")
+def _session_factory():
+    """
+    Фабрика сессий, общая для всех тестов.
+
+    Сессии привязываются к соединению конкретного теста при создании.
+    expire_on_commit оставлен по умолчанию: часть моделей полагается
+    на server_default, значения которых нужно перечитывать после commit.
+    """
+    return sessionmaker()
+
+def _isolated_connection(engine):
+    """
+    Соединение теста с внешней транзакцией, которая откатывается после теста.
+
+    Сессии теста и менеджеры сессий сервисов работают на этом соединении
+    с join_transaction_mode="create_savepoint": их commit() и rollback()
+    затрагивают только SAVEPOINT, поэтому сервисы видят данные, записанные
+    тестом, а после теста все данные удаляются откатом внешней транзакции.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+
+def _savepoint_session(connection, session_factory):
+    """Сессия на соединении теста, работающая внутри SAVEPOINT."""
+    session = session_factory(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture(scope="session")
+def _configured_models():
+    """
+    Однократно импортирует модели, настраивает отношения и мапперы.
+
+    Так первый тест с моделями не платит за импорт и конфигурацию
+    мапперов, а ошибка импорта моделей сообщается как ошибка фикстуры
+    в каждом зависящем тесте, не прерывая весь прогон.
+    """
+    from sqlalchemy.orm import configure_mappers
+    from undermaind.models import setup_relationships
+
+    _model_metadata()
+    # Настройка отношений глобальна, достаточно одного вызова на сессию
+    setup_relationships()
+    configure_mappers()
+
+@pytest.fixture(scope="function")
+def db_connection_postgres(test_engine_postgres, _configured_models):
+    """Соединение PostgreSQL теста, изолированное внешней транзакцией."""
+    yield from _isolated_connection(test_engine_postgres)
+
+@pytest.fixture(scope="function")
+def db_session_postgres(db_connection_postgres, _session_factory):
+    """
+    Сессия PostgreSQL в схеме АМИ, изолированная внешней транзакцией.
+
+    Как и в db_session_memory, commit() в тесте не оставляет данных
+    в базе: по завершении внешняя транзакция откатывается.
+    """
+    yield from _savepoint_session(db_connection_postgres, _session_factory)
+
+@pytest.fixture(scope="function")
+def session_manager_postgres(db_connection_postgres):
+    """
+    Менеджер сессий для сервисов на соединении теста.
+
+    Сервисы, созданные с этим менеджером, видят данные, записанные через
+    db_session_postgres, а их собственные изменения откатываются вместе
+    с внешней транзакцией теста. Как и create_session_factory, фабрика
+    оборачивается в scoped_session.
+
+    SAVEPOINT сессий на одном соединении должны закрываться в обратном
+    порядке, поэтому атрибуты объектов теста, истекшие после commit(),
+    читаются до вызова сервиса, а не внутри него.
+    """
+    from undermaind.core.session import SessionManager
+
+    session_factory = scoped_session(sessionmaker(
+        bind=db_connection_postgres,
+        join_transaction_mode="create_savepoint"
+    ))
+    yield SessionManager(session_factory=session_factory)
+    session_factory.remove()
+
+@pytest.fixture(scope="session")
+def test_engine_memory():
+    """
+    Движок SQLite в памяти для быстрых тестов, не требующих PostgreSQL.
+
+    pysqlite по умолчанию сам управляет транзакциями и ломает SAVEPOINT,
+    поэтому BEGIN выдаём явно (рецепт из документации SQLAlchemy).
+
+    База :memory: существует только в пределах одного соединения, поэтому
+    StaticPool отдаёт всем сессиям одно и то же соединение.
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def db_connection_memory(test_engine_memory):
+    """Соединение SQLite теста, изолированное внешней транзакцией."""
+    yield from _isolated_connection(test_engine_memory)
+
+@pytest.fixture(scope="function")
+def db_session_memory(db_connection_memory, _session_factory):
+    """
+    Сессия SQLite, изолированная внешней транзакцией.
+
+    По завершении теста внешняя транзакция откатывается, поэтому удалять
+    строки из таблиц не нужно.
+    """
+    yield from _savepoint_session(db_connection_memory, _session_factory)
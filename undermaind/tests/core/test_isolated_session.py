@@ -0,0 +1,112 @@
+"""
+Тесты изоляции сессий, которые тестам выдает conftest.
+
+Проверяется, что commit() и rollback() внутри теста работают как обычно,
+сервисы видят данные теста, а данные не выходят за пределы внешней транзакции.
+"""
+
+import pytest
+from sqlalchemy import Column, Integer, String, func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import declarative_base
+
+from undermaind.models.consciousness import ExperienceContext
+from undermaind.services.base import BaseService
+
+# Отдельная база моделей: таблица создается внутри внешней транзакции
+# теста и исчезает вместе с ее откатом
+IsolationBase = declarative_base()
+
+
+class IsolationEntity(IsolationBase):
+    """Простая модель для проверки изоляции сессий."""
+    __tablename__ = "isolation_entity"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)
+
+
+@pytest.fixture
+def isolated_session(db_session_memory):
+    """Сессия SQLite с созданной тестовой таблицей."""
+    IsolationBase.metadata.create_all(db_session_memory.connection())
+    return db_session_memory
+
+
+def _count(session):
+    return session.scalar(select(func.count()).select_from(IsolationEntity))
+
+
+def test_commit_then_read_back(isolated_session):
+    """Данные, зафиксированные в тесте, видны последующим запросам."""
+    isolated_session.add(IsolationEntity(name="Первая запись"))
+    isolated_session.commit()
+
+    assert _count(isolated_session) == 1
+
+    isolated_session.add(IsolationEntity(name="Вторая запись"))
+    isolated_session.commit()
+
+    assert _count(isolated_session) == 2
+
+
+def test_rollback_keeps_committed_data(isolated_session):
+    """rollback() после ошибки отменяет только незафиксированные изменения."""
+    isolated_session.add(IsolationEntity(name="Запись"))
+    isolated_session.commit()
+
+    isolated_session.add(IsolationEntity(name="Запись"))
+    with pytest.raises(IntegrityError):
+        isolated_session.commit()
+    isolated_session.rollback()
+
+    assert _count(isolated_session) == 1
+
+
+def test_data_does_not_leak_between_tests(db_session_memory):
+    """Таблица и данные предыдущих тестов откатываются вместе с внешней транзакцией."""
+    exists = db_session_memory.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'isolation_entity'"
+    )).scalar()
+
+    assert exists is None
+
+
+SERVICE_CONTEXT_TITLE = "Контекст, созданный сервисом"
+
+
+@pytest.mark.integration
+def test_service_shares_test_connection(db_session_postgres, session_manager_postgres):
+    """Сервис видит данные теста, а тест видит изменения сервиса."""
+    context = ExperienceContext(
+        title="Контекст теста",
+        context_type=ExperienceContext.CONTEXT_TYPE_CONVERSATION
+    )
+    db_session_postgres.add(context)
+    db_session_postgres.commit()
+    context_id = context.id
+
+    service = BaseService(session_manager=session_manager_postgres)
+
+    def _read_and_add(session):
+        title = session.get(ExperienceContext, context_id).title
+        session.add(ExperienceContext(
+            title=SERVICE_CONTEXT_TITLE,
+            context_type=ExperienceContext.CONTEXT_TYPE_CONVERSATION
+        ))
+        return title
+
+    assert service._execute_in_isolated_transaction(_read_and_add) == "Контекст теста"
+    assert db_session_postgres.scalar(
+        select(func.count()).select_from(ExperienceContext)
+        .where(ExperienceContext.title == SERVICE_CONTEXT_TITLE)
+    ) == 1
+
+
+@pytest.mark.integration
+def test_service_changes_do_not_leak_between_tests(db_session_postgres):
+    """Изменения сервиса откатываются вместе с внешней транзакцией теста."""
+    assert db_session_postgres.scalar(
+        select(func.count()).select_from(ExperienceContext)
+        .where(ExperienceContext.title == SERVICE_CONTEXT_TITLE)
+    ) == 0
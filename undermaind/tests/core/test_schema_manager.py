@@ -0,0 +1,49 @@
+"""
+Тесты для модуля schema_manager.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from undermaind.config import Config
+from undermaind.core import schema_manager
+from undermaind.core.schema_manager import SchemaManager
+
+
+def _config() -> Config:
+    """Конфигурация с параметрами подключения, отличными от значений по умолчанию."""
+    return Config(
+        db_host="db.example", db_port=6543, db_name="family_db",
+        admin_user="admin", admin_password="secret",
+        ami_name="ami", ami_password="ami_secret", schema="ami"
+    )
+
+def test_build_url_from_config():
+    """Тест того, что URL подключения собирается из полей Config."""
+    url = SchemaManager(_config())._build_url("ami", "pass#word")
+    
+    assert url.host == "db.example"
+    assert url.port == 6543
+    assert url.database == "family_db"
+    assert url.password == "pass#word"
+    
+    other_url = SchemaManager(_config())._build_url("ami", "pass", database="other_db")
+    assert other_url.database == "other_db"
+
+@pytest.mark.parametrize("pool_pre_ping", [True, False])
+def test_schema_engine_pre_ping_from_config(monkeypatch, pool_pre_ping):
+    """Тест того, что движок схемы следует настройке pool_pre_ping, как EngineManager."""
+    engine_kwargs = {}
+    
+    def _create_engine(url, **kwargs):
+        engine_kwargs.update(kwargs)
+        return create_engine("sqlite://")
+    
+    monkeypatch.setattr(schema_manager, "create_engine", _create_engine)
+    config = _config()
+    config.pool_pre_ping = pool_pre_ping
+    
+    engine = SchemaManager(config).create_engine_for_schema("ami", "ami_secret")
+    
+    assert engine_kwargs["pool_pre_ping"] is pool_pre_ping
+    engine.dispose()
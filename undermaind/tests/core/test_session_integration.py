@@ -9,12 +9,11 @@
 import logging
 import os
 import pytest
-import dotenv
 from pathlib import Path
+from dotenv import dotenv_values
 from sqlalchemy import Column, Integer, String, MetaData, Table, text, inspect
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
-from undermaind.core.engine import create_db_engine
 from undermaind.core.session import (
     create_session_factory, session_scope, create_isolated_session, 
     isolated_session_scope, begin_nested_transaction, refresh_transaction_view,
@@ -41,162 +40,176 @@ class SessionTestEntity(Base):
         return f"<SessionTestEntity(id={self.id}, name='{self.name}')>"
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def test_config_path():
     """Путь к файлу конфигурации для тестовой среды."""
-    # Ищем в каталоге tests от корня проекта
-    base_dir = Path(__file__).resolve().parents[1]
-    config_path = base_dir / "test_config.env"
-    
-    # Если не нашли, ищем в родительском каталоге
-    if not config_path.exists():
-        config_path = base_dir.parent / "test_config.env"
-    
-    return config_path
+    # Тот же файл в корне проекта, что использует conftest
+    return Path(__file__).resolve().parents[3] / "family_config_test.env"
 
 
-@pytest.fixture(scope="module")
-def test_config(test_config_path):
-    """Создает тестовую конфигурацию на основе файла test_config.env."""
-    # Проверяем существование файла
-    config_path = test_config_path
-    if not config_path.exists():
-        pytest.skip(f"Файл конфигурации не найден: {config_path}")
+@pytest.fixture(scope="session")
+def env_vars(test_config_path):
+    """
+    Переменные тестовой среды, один раз прочитанные из файла конфигурации.
     
-    # Загружаем переменные окружения из файла
-    dotenv.load_dotenv(config_path)
+    Файл разбирается в обычный словарь без изменения os.environ, поэтому
+    конфигурация тестов не зависит от окружения процесса.
+    """
+    # Проверяем существование файла
+    if not test_config_path.exists():
+        pytest.skip(f"Файл конфигурации не найден: {test_config_path}")
     
-    # Создаем конфигурацию из переменных окружения с префиксом FAMILY_
+    return dotenv_values(test_config_path)
+
+
+@pytest.fixture(scope="session")
+def test_config(env_vars):
+    """Создает тестовую конфигурацию на основе файла family_config_test.env."""
+    # Создаем конфигурацию из переменных с префиксом FAMILY_
     return Config(
-        DB_NAME=os.environ.get("FAMILY_DB_NAME", "family_db"),
-        DB_HOST=os.environ.get("FAMILY_DB_HOST", "localhost"),
-        DB_PORT=os.environ.get("FAMILY_DB_PORT", "5432"),
-        DB_USERNAME=os.environ.get("FAMILY_ADMIN_USER", "family_admin"),
-        DB_PASSWORD=os.environ.get("FAMILY_ADMIN_PASSWORD", ""),
-        DB_SCHEMA=os.environ.get("FAMILY_DB_SCHEMA", "ami_memory"),
+        db_name=env_vars.get("FAMILY_DB_NAME", "family_db"),
+        db_host=env_vars.get("FAMILY_DB_HOST", "localhost"),
+        db_port=int(env_vars.get("FAMILY_DB_PORT", "5432")),
+        admin_user=env_vars.get("FAMILY_ADMIN_USER", "family_admin"),
+        admin_password=env_vars.get("FAMILY_ADMIN_PASSWORD", ""),
+        ami_name=env_vars.get("FAMILY_AMI_USER", "ami_user"),
+        ami_password=env_vars.get("FAMILY_AMI_PASSWORD", ""),
+        schema=env_vars.get("FAMILY_DB_SCHEMA", "ami_memory"),
         # Дополнительные параметры для тестов
-        DB_POOL_SIZE=2,
-        DB_ECHO_SQL=False,
-        DB_POOL_RECYCLE=5 # Для теста переиспользования соединений
+        pool_size=5,
+        echo_sql=False,
+        pool_recycle=5 # Для теста переиспользования соединений
     )
 
 
-@pytest.fixture(scope="module")
-def admin_credentials():
-    """Получает учетные данные администратора PostgreSQL из переменных окружения."""
-    # Используем FAMILY_ADMIN_* переменные из test_config.env
-    admin_user = os.environ.get("FAMILY_ADMIN_USER")
-    admin_password = os.environ.get("FAMILY_ADMIN_PASSWORD")
-    
-    # Пропускаем тесты, если учетные данные не предоставлены
-    if not admin_user or not admin_password:
-        pytest.skip("Не указаны учетные данные администратора (FAMILY_ADMIN_USER/FAMILY_ADMIN_PASSWORD) в файле test_config.env. "
-                   "Эти данные необходимы для создания тестовой схемы и запуска интеграционных тестов.")
-    
-    return admin_user, admin_password
-
-
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def schema_manager(test_config, admin_credentials):
-    """Создает экземпляр SchemaManager с установленными учетными данными администратора."""
+    """
+    Создает экземпляр SchemaManager с установленными учетными данными администратора.
+    
+    Фикстура уровня сессии: менеджер, его административный движок и проверка
+    create_database создаются один раз на весь прогон тестов.
+    """
     admin_user, admin_password = admin_credentials
     manager = SchemaManager(test_config)
     manager.set_admin_credentials(admin_user, admin_password)
     
     # Создаем базу данных, если она не существует
     if not manager.create_database():
-        pytest.skip(f"Не удалось создать базу данных {test_config.DB_NAME}")
+        pytest.skip(f"Не удалось создать базу данных {test_config.db_name}")
     
-    return manager
+    yield manager
+    
+    # Закрываем движки менеджера в конце сессии
+    manager.dispose_engines()
 
 
-@pytest.fixture(scope="module")
-def admin_engine(test_config, admin_credentials):
-    """Создает движок с правами администратора для управления схемами и таблицами."""
-    admin_user, admin_password = admin_credentials
-    admin_config = Config(
-        DB_NAME=test_config.DB_NAME,
-        DB_HOST=test_config.DB_HOST,
-        DB_PORT=test_config.DB_PORT,
-        DB_USERNAME=admin_user,
-        DB_PASSWORD=admin_password,
-        DB_SCHEMA="public",
-        DB_POOL_SIZE=1,
-        DB_ECHO_SQL=False
-    )
-    return create_db_engine(admin_config, for_admin_tasks=True)
+@pytest.fixture(scope="session")
+def admin_engine(schema_manager):
+    """
+    Движок с правами администратора для управления схемами и таблицами.
+    
+    Берется у SchemaManager: он уже настроен на учетные данные администратора
+    и использует NullPool, так что редкие административные операции не
+    держат пул простаивающих соединений. Режим AUTOCOMMIT избавляет DDL
+    от лишних BEGIN/COMMIT: каждая команда (или пакет) фиксируется сразу.
+    """
+    return schema_manager.admin_engine.execution_options(isolation_level="AUTOCOMMIT")
 
 
-@pytest.fixture(scope="module")
-def setup_test_schema(test_config, schema_manager, admin_engine):
-    """Создает тестовую схему и таблицу для тестирования сессий."""
-    schema_name = "session_test_schema"
+@pytest.fixture(scope="session")
+def test_schema_name():
+    """
+    Имя тестовой схемы для текущего воркера pytest-xdist.
     
-    try:
-        # Если схема существует, удаляем её (для чистоты тестов)
-        if schema_manager.schema_exists(schema_name):
-            schema_manager.drop_schema(schema_name, cascade=True, drop_user=True)
-            
-        # Создаем новую схему с правами для тестов
-        schema_manager.create_schema(schema_name, "test_password", create_user=True)
-        
-        # Создаем таблицу для тестов сессий в этой схеме
-        with admin_engine.connect() as conn:
-            conn.execute(text(f"""
-                CREATE TABLE IF NOT EXISTS {schema_name}.session_test_entity (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(50) NOT NULL,
-                    description VARCHAR(200)
-                )
-            """))
-            # Предоставляем права обычному пользователю
-            conn.execute(text(f"""
-                GRANT ALL PRIVILEGES ON {schema_name}.session_test_entity TO {schema_name}
-            """))
-            # Предоставляем права на последовательность
-            conn.execute(text(f"""
-                GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA {schema_name} TO {schema_name}
-            """))
-            conn.commit()
-            logger.info(f"Таблица {schema_name}.session_test_entity создана для тестирования сессий")
-        
-        yield schema_name
-        
-    finally:
-        # Очистка после тестов (гарантируем выполнение)
-        schema_manager.drop_schema(schema_name, cascade=True, drop_user=True)
-        logger.info(f"Тестовая схема {schema_name} удалена")
+    При параллельном запуске каждый воркер работает в своей схеме, чтобы
+    очистка таблицы на одном воркере не затрагивала тесты на другом.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return f"session_test_schema_{worker}" if worker else "session_test_schema"
 
 
-@pytest.fixture(scope="module")
-def session_engine(test_config, setup_test_schema):
-    """Создает движок для тестирования сессий."""
-    schema_name = setup_test_schema
+@pytest.fixture(scope="session")
+def setup_test_schema(test_config, schema_manager, admin_engine, test_schema_name):
+    """
+    Создает тестовую схему и таблицу для тестирования сессий.
     
-    # Создаем конфигурацию для подключения к тестовой схеме
-    session_config = Config(
-        DB_NAME=test_config.DB_NAME,
-        DB_HOST=test_config.DB_HOST,
-        DB_PORT=test_config.DB_PORT,
-        DB_USERNAME=schema_name,  # Используем имя схемы как имя пользователя
-        DB_PASSWORD="test_password",
-        DB_SCHEMA=schema_name,
-        DB_POOL_SIZE=1,
-        DB_ECHO_SQL=False
-    )
+    Схема и её пользователь создаются один раз и сохраняются между
+    прогонами: пересоздание схемы с пользователем стоит заметно дороже
+    очистки единственной тестовой таблицы.
+    """
+    schema_name = test_schema_name
     
-    # Создаем движок для обычного пользователя
-    engine = create_db_engine(session_config, for_admin_tasks=False)
+    # Создаем схему с правами для тестов (существующая схема и
+    # пользователь переиспользуются)
+    schema_manager.create_schema(schema_name, "test_password", create_user=True)
     
-    return engine
+    # Создаем таблицу для тестов сессий в этой схеме (UNLOGGED: без WAL,
+    # тесты не полагаются на восстановление данных после сбоя)
+    # Все команды отправляются одним пакетом за один обмен с сервером
+    with admin_engine.connect() as conn:
+        conn.exec_driver_sql(f"""
+            CREATE UNLOGGED TABLE IF NOT EXISTS {schema_name}.session_test_entity (
+                id SERIAL PRIMARY KEY,
+                name VARCHAR(50) NOT NULL,
+                description VARCHAR(200)
+            );
+            -- Предоставляем права обычному пользователю
+            GRANT ALL PRIVILEGES ON {schema_name}.session_test_entity TO {schema_name};
+            -- Предоставляем права на последовательность
+            GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA {schema_name} TO {schema_name};
+            -- Убираем записи, оставшиеся от прерванного прогона
+            TRUNCATE TABLE {schema_name}.session_test_entity RESTART IDENTITY
+        """)
+        logger.info(f"Таблица {schema_name}.session_test_entity создана для тестирования сессий")
+    
+    # Схема не удаляется после тестов: она переиспользуется следующим
+    # прогоном, а записи после каждого теста убирает _clean_session_test_entity
+    return schema_name
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
+def session_engine(schema_manager, setup_test_schema):
+    """
+    Создает движок для тестирования сессий.
+    
+    Движок пользователя схемы создается SchemaManager один раз на сессию:
+    менеджер кеширует его и закрывает в конце прогона.
+    """
+    schema_name = setup_test_schema
+    
+    # Используем имя схемы как имя пользователя
+    return schema_manager.create_engine_for_schema(schema_name, "test_password")
+
+
+@pytest.fixture(scope="session")
 def session_factory(session_engine):
     """Создает фабрику сессий для тестирования."""
     return create_session_factory(session_engine)
 
 
+@pytest.fixture(autouse=True)
+def _clean_session_test_entity(request):
+    """
+    Очищает тестовую таблицу после каждого теста, работающего со схемой.
+    
+    Заменяет блоки try/finally с DELETE в самих тестах: одна команда TRUNCATE
+    выполняется даже при падении теста. Тесты без схемы не затрагиваются.
+    """
+    if "setup_test_schema" not in request.fixturenames:
+        yield
+        return
+    
+    schema_name = request.getfixturevalue("setup_test_schema")
+    admin_engine = request.getfixturevalue("admin_engine")
+    yield
+    
+    with admin_engine.connect() as conn:
+        conn.execute(text(
+            f"TRUNCATE TABLE {schema_name}.session_test_entity RESTART IDENTITY"
+        ))
+
+
 @pytest.mark.integration
 class TestSessionIntegration:
     """
@@ -206,13 +219,16 @@ class TestSessionIntegration:
     и правильное закрытие сессий после работы.
     """
     
-    def test_create_session_factory(self, session_engine):
+    def test_create_session_factory(self, test_engine_memory):
         """
         Проверяет, что функция create_session_factory корректно создает
         фабрику сессий SQLAlchemy.
+        
+        Тест не обращается к базе, поэтому не зависит от тестовой схемы и
+        SchemaManager и использует SQLite в памяти.
         """
         # Создаем фабрику сессий
-        factory = create_session_factory(session_engine)
+        factory = create_session_factory(test_engine_memory)
         
         # Проверяем, что фабрика создана и имеет ожидаемые методы
         assert factory is not None
@@ -221,7 +237,7 @@ class TestSessionIntegration:
         
         # Проверяем, что фабрика привязана к правильному движку
         session = factory()
-        assert session.bind == session_engine
+        assert session.bind == test_engine_memory
         session.close()
     
     def test_session_scope_commit(self, session_factory, setup_test_schema):
@@ -234,42 +250,33 @@ class TestSessionIntegration:
         test_name = "Тестовая запись 1"
         test_description = "Описание тестовой записи для проверки commit"
         
-        try:
-            # Используем контекстный менеджер для автоматического коммита
-            with session_scope(session_factory) as session:
-                # Проверяем, что сессия активна
-                assert session.is_active
-                
-                # Вставляем тестовую запись с помощью SQL запроса
-                session.execute(
-                    text(f"""
-                        INSERT INTO {schema_name}.session_test_entity (name, description)
-                        VALUES (:name, :description)
-                    """),
-                    {"name": test_name, "description": test_description}
-                )
+        # Используем контекстный менеджер для автоматического коммита
+        with session_scope(session_factory) as session:
+            # Проверяем, что сессия активна
+            assert session.is_active
             
-            # Проверяем, что запись действительно сохранена в БД
-            with session_scope(session_factory) as session:
-                result = session.execute(
-                    text(f"""
-                        SELECT name, description FROM {schema_name}.session_test_entity
-                        WHERE name = :name
-                    """),
-                    {"name": test_name}
-                ).fetchone()
-                
-                assert result is not None
-                assert result[0] == test_name
-                assert result[1] == test_description
-                
-        finally:
-            # Очищаем тестовые данные
-            with session_scope(session_factory) as session:
-                session.execute(
-                    text(f"DELETE FROM {schema_name}.session_test_entity WHERE name = :name"),
-                    {"name": test_name}
-                )
+            # Вставляем тестовую запись с помощью SQL запроса
+            session.execute(
+                text(f"""
+                    INSERT INTO {schema_name}.session_test_entity (name, description)
+                    VALUES (:name, :description)
+                """),
+                {"name": test_name, "description": test_description}
+            )
+        
+        # Проверяем, что запись действительно сохранена в БД
+        with session_scope(session_factory) as session:
+            result = session.execute(
+                text(f"""
+                    SELECT name, description FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": test_name}
+            ).fetchone()
+            
+            assert result is not None
+            assert result[0] == test_name
+            assert result[1] == test_description
     
     def test_session_scope_rollback(self, session_factory, setup_test_schema):
         """
@@ -280,55 +287,46 @@ class TestSessionIntegration:
         # Подготавливаем тестовые данные
         test_name = "Тестовая запись для отката"
         
+        # Пытаемся выполнить операцию, которая вызовет исключение 
+        # (нарушение ограничения NOT NULL)
         try:
-            # Пытаемся выполнить операцию, которая вызовет исключение 
-            # (нарушение ограничения NOT NULL)
-            try:
-                with session_scope(session_factory) as session:
-                    # Сначала вставляем валидную запись
-                    session.execute(
-                        text(f"""
-                            INSERT INTO {schema_name}.session_test_entity (name, description)
-                            VALUES (:name, :description)
-                        """),
-                        {"name": test_name, "description": "Это описание будет откачено"}
-                    )
-                    
-                    # Затем пытаемся вставить невалидную запись (без name)
-                    session.execute(
-                        text(f"""
-                            INSERT INTO {schema_name}.session_test_entity (description)
-                            VALUES (:description)
-                        """),
-                        {"description": "Эта запись вызовет ошибку"}
-                    )
-                    
-                # Если мы дошли до этой точки, значит исключение не было выброшено - это ошибка
-                pytest.fail("Ожидалось исключение из-за нарушения ограничения NOT NULL")
-                
-            except SQLAlchemyError:
-                # Это ожидаемое поведение - транзакция должна быть откачена
-                pass
-            
-            # Проверяем, что ни одна из записей не была сохранена в БД из-за отката
             with session_scope(session_factory) as session:
-                result = session.execute(
+                # Сначала вставляем валидную запись
+                session.execute(
                     text(f"""
-                        SELECT COUNT(*) FROM {schema_name}.session_test_entity
-                        WHERE name = :name
+                        INSERT INTO {schema_name}.session_test_entity (name, description)
+                        VALUES (:name, :description)
                     """),
-                    {"name": test_name}
-                ).scalar()
-                
-                assert result == 0, "Запись не должна была сохраниться из-за отката транзакции"
+                    {"name": test_name, "description": "Это описание будет откачено"}
+                )
                 
-        finally:
-            # Очищаем тестовые данные на всякий случай
-            with session_scope(session_factory) as session:
+                # Затем пытаемся вставить невалидную запись (без name)
                 session.execute(
-                    text(f"DELETE FROM {schema_name}.session_test_entity WHERE name = :name"),
-                    {"name": test_name}
+                    text(f"""
+                        INSERT INTO {schema_name}.session_test_entity (description)
+                        VALUES (:description)
+                    """),
+                    {"description": "Эта запись вызовет ошибку"}
                 )
+                
+            # Если мы дошли до этой точки, значит исключение не было выброшено - это ошибка
+            pytest.fail("Ожидалось исключение из-за нарушения ограничения NOT NULL")
+            
+        except SQLAlchemyError:
+            # Это ожидаемое поведение - транзакция должна быть откачена
+            pass
+        
+        # Проверяем, что ни одна из записей не была сохранена в БД из-за отката
+        with session_scope(session_factory) as session:
+            result = session.execute(
+                text(f"""
+                    SELECT COUNT(*) FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": test_name}
+            ).scalar()
+            
+            assert result == 0, "Запись не должна была сохраниться из-за отката транзакции"
     
     def test_session_multiple_operations(self, session_factory, setup_test_schema):
         """
@@ -343,74 +341,62 @@ class TestSessionIntegration:
             {"name": "Запись 3", "description": "Третья тестовая запись"}
         ]
         
-        try:
-            # Вставляем несколько записей в одной транзакции
-            with session_scope(session_factory) as session:
-                for record in test_records:
-                    session.execute(
-                        text(f"""
-                            INSERT INTO {schema_name}.session_test_entity (name, description)
-                            VALUES (:name, :description)
-                        """),
-                        record
-                    )
-            
-            # Проверяем, что все записи сохранены
-            with session_scope(session_factory) as session:
-                result = session.execute(
-                    text(f"""
-                        SELECT COUNT(*) FROM {schema_name}.session_test_entity
-                        WHERE name IN ('Запись 1', 'Запись 2', 'Запись 3')
-                    """)
-                ).scalar()
-                
-                assert result == 3, "Должны быть сохранены все три записи"
-                
-                # Проверяем каждую запись
-                for record in test_records:
-                    result = session.execute(
-                        text(f"""
-                            SELECT description FROM {schema_name}.session_test_entity
-                            WHERE name = :name
-                        """),
-                        {"name": record["name"]}
-                    ).scalar()
-                    
-                    assert result == record["description"]
-                
-            # Проверяем обновление данных
-            with session_scope(session_factory) as session:
-                # Обновляем описание для первой записи
-                session.execute(
-                    text(f"""
-                        UPDATE {schema_name}.session_test_entity
-                        SET description = :new_description
-                        WHERE name = :name
-                    """),
-                    {"name": "Запись 1", "new_description": "Обновленное описание"}
-                )
+        # Вставляем несколько записей в одной транзакции одним executemany
+        with session_scope(session_factory) as session:
+            session.execute(
+                text(f"""
+                    INSERT INTO {schema_name}.session_test_entity (name, description)
+                    VALUES (:name, :description)
+                """),
+                test_records
+            )
+        
+        # Проверяем, что все записи сохранены
+        with session_scope(session_factory) as session:
+            result = session.execute(
+                text(f"""
+                    SELECT COUNT(*) FROM {schema_name}.session_test_entity
+                    WHERE name IN ('Запись 1', 'Запись 2', 'Запись 3')
+                """)
+            ).scalar()
             
-            # Проверяем, что обновление применилось
-            with session_scope(session_factory) as session:
+            assert result == 3, "Должны быть сохранены все три записи"
+            
+            # Проверяем каждую запись
+            for record in test_records:
                 result = session.execute(
                     text(f"""
                         SELECT description FROM {schema_name}.session_test_entity
                         WHERE name = :name
                     """),
-                    {"name": "Запись 1"}
+                    {"name": record["name"]}
                 ).scalar()
                 
-                assert result == "Обновленное описание"
-                
-        finally:
-            # Очищаем тестовые данные
-            with session_scope(session_factory) as session:
-                session.execute(
-                    text(f"""
-                        DELETE FROM {schema_name}.session_test_entity
-                        WHERE name IN ('Запись 1', 'Запись 2', 'Запись 3')
-                    """)
-                )
+                assert result == record["description"]
+            
+        # Проверяем обновление данных
+        with session_scope(session_factory) as session:
+            # Обновляем описание для первой записи
+            session.execute(
+                text(f"""
+                    UPDATE {schema_name}.session_test_entity
+                    SET description = :new_description
+                    WHERE name = :name
+                """),
+                {"name": "Запись 1", "new_description": "Обновленное описание"}
+            )
+        
+        # Проверяем, что обновление применилось
+        with session_scope(session_factory) as session:
+            result = session.execute(
+                text(f"""
+                    SELECT description FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": "Запись 1"}
+            ).scalar()
+            
+            assert result == "Обновленное описание"
     
     def test_session_independence(self, session_factory, setup_test_schema):
         """
@@ -422,97 +408,88 @@ class TestSessionIntegration:
         # Подготавливаем тестовые данные
         test_name = "Запись для проверки сессий"
         
+        # Создаем две сессии
+        session1 = session_factory()
+        session2 = session_factory()
+        
         try:
-            # Создаем две сессии
-            session1 = session_factory()
-            session2 = session_factory()
+            # Шаг 1: Добавляем запись в первой сессии и коммитим
+            session1.execute(
+                text(f"""
+                    INSERT INTO {schema_name}.session_test_entity (name, description)
+                    VALUES (:name, :description)
+                """),
+                {"name": test_name, "description": "Сессия 1"}
+            )
+            session1.commit()
+            
+            # Шаг 2: Проверяем, что запись видна во второй сессии после коммита
+            result = session2.execute(
+                text(f"""
+                    SELECT description FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": test_name}
+            ).scalar()
+            assert result == "Сессия 1", "Закоммиченные изменения должны быть видны в другой сессии"
+            
+            # Шаг 3: Обновляем запись во второй сессии и коммитим
+            session2.execute(
+                text(f"""
+                    UPDATE {schema_name}.session_test_entity
+                    SET description = 'Сессия 2'
+                    WHERE name = :name
+                """),
+                {"name": test_name}
+            )
+            session2.commit()
+            
+            # Шаг 4: Проверяем, что изменения видны в первой сессии после коммита
+            # Но сначала обновляем транзакцию, чтобы точно получить актуальные данные
+            refresh_transaction_view(session1)
+            
+            result = session1.execute(
+                text(f"""
+                    SELECT description FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": test_name}
+            ).scalar()
+            assert result == "Сессия 2", "Закоммиченные изменения должны быть видны в первой сессии после обновления транзакции"
+            
+            # Шаг 5: Демонстрация работы вложенных транзакций
+            # Начинаем вложенную транзакцию в первой сессии
+            nested = begin_nested_transaction(session1)
+            
+            # Обновляем запись во вложенной транзакции
+            session1.execute(
+                text(f"""
+                    UPDATE {schema_name}.session_test_entity
+                    SET description = 'Вложенная транзакция'
+                    WHERE name = :name
+                """),
+                {"name": test_name}
+            )
+            
+            # Откатываем вложенную транзакцию
+            nested.rollback()
+            
+            # Проверяем, что изменения из вложенной транзакции не сохранились
+            result = session1.execute(
+                text(f"""
+                    SELECT description FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": test_name}
+            ).scalar()
+            assert result == "Сессия 2", "Изменения из отмененной вложенной транзакции не должны сохраниться"
+            
+            # Фиксируем изменения в первой сессии
+            session1.commit()
             
-            try:
-                # Шаг 1: Добавляем запись в первой сессии и коммитим
-                session1.execute(
-                    text(f"""
-                        INSERT INTO {schema_name}.session_test_entity (name, description)
-                        VALUES (:name, :description)
-                    """),
-                    {"name": test_name, "description": "Сессия 1"}
-                )
-                session1.commit()
-                
-                # Шаг 2: Проверяем, что запись видна во второй сессии после коммита
-                result = session2.execute(
-                    text(f"""
-                        SELECT description FROM {schema_name}.session_test_entity
-                        WHERE name = :name
-                    """),
-                    {"name": test_name}
-                ).scalar()
-                assert result == "Сессия 1", "Закоммиченные изменения должны быть видны в другой сессии"
-                
-                # Шаг 3: Обновляем запись во второй сессии и коммитим
-                session2.execute(
-                    text(f"""
-                        UPDATE {schema_name}.session_test_entity
-                        SET description = 'Сессия 2'
-                        WHERE name = :name
-                    """),
-                    {"name": test_name}
-                )
-                session2.commit()
-                
-                # Шаг 4: Проверяем, что изменения видны в первой сессии после коммита
-                # Но сначала обновляем транзакцию, чтобы точно получить актуальные данные
-                refresh_transaction_view(session1)
-                
-                result = session1.execute(
-                    text(f"""
-                        SELECT description FROM {schema_name}.session_test_entity
-                        WHERE name = :name
-                    """),
-                    {"name": test_name}
-                ).scalar()
-                assert result == "Сессия 2", "Закоммиченные изменения должны быть видны в первой сессии после обновления транзакции"
-                
-                # Шаг 5: Демонстрация работы вложенных транзакций
-                # Начинаем вложенную транзакцию в первой сессии
-                nested = begin_nested_transaction(session1)
-                
-                # Обновляем запись во вложенной транзакции
-                session1.execute(
-                    text(f"""
-                        UPDATE {schema_name}.session_test_entity
-                        SET description = 'Вложенная транзакция'
-                        WHERE name = :name
-                    """),
-                    {"name": test_name}
-                )
-                
-                # Откатываем вложенную транзакцию
-                nested.rollback()
-                
-                # Проверяем, что изменения из вложенной транзакции не сохранились
-                result = session1.execute(
-                    text(f"""
-                        SELECT description FROM {schema_name}.session_test_entity
-                        WHERE name = :name
-                    """),
-                    {"name": test_name}
-                ).scalar()
-                assert result == "Сессия 2", "Изменения из отмененной вложенной транзакции не должны сохраниться"
-                
-                # Фиксируем изменения в первой сессии
-                session1.commit()
-                
-            finally:
-                session1.close()
-                session2.close()
-                
         finally:
-            # Очищаем тестовые данные
-            with session_scope(session_factory) as session:
-                session.execute(
-                    text(f"DELETE FROM {schema_name}.session_test_entity WHERE name = :name"),
-                    {"name": test_name}
-                )
+            session1.close()
+            session2.close()
     
     def test_concurrent_sessions(self, session_factory, setup_test_schema):
         """
@@ -525,55 +502,40 @@ class TestSessionIntegration:
         # Уникальные идентификаторы для тестовых записей
         test_prefixes = ["Компонент A", "Компонент B", "Компонент C"]
         
-        try:
-            # Имитируем работу трех компонентов системы в отдельных сессиях
-            for i, prefix in enumerate(test_prefixes):
-                with session_scope(session_factory) as session:
-                    # Каждый компонент создает свою запись
-                    session.execute(
-                        text(f"""
-                            INSERT INTO {schema_name}.session_test_entity (name, description)
-                            VALUES (:name, :description)
-                        """),
-                        {
-                            "name": f"{prefix} - Запись",
-                            "description": f"Запись создана компонентом {prefix}"
-                        }
-                    )
-            
-            # Проверяем, что все записи сохранены
-            with session_scope(session_factory) as session:
-                for prefix in test_prefixes:
-                    result = session.execute(
-                        text(f"""
-                            SELECT description FROM {schema_name}.session_test_entity
-                            WHERE name = :name
-                        """),
-                        {"name": f"{prefix} - Запись"}
-                    ).scalar()
-                    
-                    assert result is not None
-                    assert f"компонентом {prefix}" in result
-                
-                # Проверяем общее количество записей
-                result = session.execute(
-                    text(f"""
-                        SELECT COUNT(*) FROM {schema_name}.session_test_entity
-                        WHERE name LIKE '%Компонент%'
-                    """)
-                ).scalar()
-                
-                assert result == len(test_prefixes)
-                
-        finally:
-            # Очищаем тестовые данные
+        # Имитируем работу трех компонентов системы в отдельных сессиях
+        for i, prefix in enumerate(test_prefixes):
             with session_scope(session_factory) as session:
+                # Каждый компонент создает свою запись
                 session.execute(
                     text(f"""
-                        DELETE FROM {schema_name}.session_test_entity
-                        WHERE name LIKE '%Компонент%'
-                    """)
+                        INSERT INTO {schema_name}.session_test_entity (name, description)
+                        VALUES (:name, :description)
+                    """),
+                    {
+                        "name": f"{prefix} - Запись",
+                        "description": f"Запись создана компонентом {prefix}"
+                    }
                 )
+        
+        # Проверяем, что все записи сохранены: записи компонентов читаются
+        # одним запросом вместо отдельного запроса на каждую запись и подсчета
+        with session_scope(session_factory) as session:
+            rows = session.execute(
+                text(f"""
+                    SELECT name, description FROM {schema_name}.session_test_entity
+                    WHERE name LIKE '%Компонент%'
+                """)
+            ).all()
+            descriptions = dict(rows)
+            
+            for prefix in test_prefixes:
+                result = descriptions.get(f"{prefix} - Запись")
+                
+                assert result is not None
+                assert f"компонентом {prefix}" in result
+            
+            # Проверяем общее количество записей
+            assert len(rows) == len(test_prefixes)
     
     def test_isolated_session_scope(self, session_factory, setup_test_schema):
         """
@@ -584,36 +546,27 @@ class TestSessionIntegration:
         schema_name = setup_test_schema
         test_name = "Тест изолированной сессии"
         
-        try:
-            # Вставляем данные в изолированной сессии с высоким уровнем изоляции
-            with isolated_session_scope(session_factory, "SERIALIZABLE") as session:
-                session.execute(
-                    text(f"""
-                        INSERT INTO {schema_name}.session_test_entity (name, description)
-                        VALUES (:name, :description)
-                    """),
-                    {"name": test_name, "description": "Изолированная сессия"}
-                )
+        # Вставляем данные в изолированной сессии с высоким уровнем изоляции
+        with isolated_session_scope(session_factory, "SERIALIZABLE") as session:
+            session.execute(
+                text(f"""
+                    INSERT INTO {schema_name}.session_test_entity (name, description)
+                    VALUES (:name, :description)
+                """),
+                {"name": test_name, "description": "Изолированная сессия"}
+            )
+        
+        # Проверяем, что данные сохранены
+        with session_scope(session_factory) as session:
+            result = session.execute(
+                text(f"""
+                    SELECT description FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": test_name}
+            ).scalar()
             
-            # Проверяем, что данные сохранены
-            with session_scope(session_factory) as session:
-                result = session.execute(
-                    text(f"""
-                        SELECT description FROM {schema_name}.session_test_entity
-                        WHERE name = :name
-                    """),
-                    {"name": test_name}
-                ).scalar()
-                
-                assert result == "Изолированная сессия"
-                
-        finally:
-            # Очищаем тестовые данные
-            with session_scope(session_factory) as session:
-                session.execute(
-                    text(f"DELETE FROM {schema_name}.session_test_entity WHERE name = :name"),
-                    {"name": test_name}
-                )
+            assert result == "Изолированная сессия"
     
     def test_nested_transaction(self, session_factory, setup_test_schema):
         """
@@ -625,40 +578,77 @@ class TestSessionIntegration:
         test_name_outer = "Внешняя транзакция"
         test_name_nested = "Вложенная транзакция"
         
+        # Создаем сессию для тестирования вложенных транзакций
+        session = session_factory()
+        
         try:
-            # Создаем сессию для тестирования вложенных транзакций
-            session = session_factory()
+            # Начинаем внешнюю транзакцию
+            session.begin()
             
+            # Вставляем первую запись во внешней транзакции
+            session.execute(
+                text(f"""
+                    INSERT INTO {schema_name}.session_test_entity (name, description)
+                    VALUES (:name, :description)
+                """),
+                {"name": test_name_outer, "description": "Запись из внешней транзакции"}
+            )
+            
+            # Начинаем вложенную транзакцию (SAVEPOINT)
+            nested = begin_nested_transaction(session)
+            
+            # Вставляем запись во вложенной транзакции
+            session.execute(
+                text(f"""
+                    INSERT INTO {schema_name}.session_test_entity (name, description)
+                    VALUES (:name, :description)
+                """),
+                {"name": test_name_nested, "description": "Запись из вложенной транзакции"}
+            )
+            
+            # Откатываем вложенную транзакцию
+            nested.rollback()
+            
+            # Проверяем, что запись из вложенной транзакции не сохранилась
+            result = session.execute(
+                text(f"""
+                    SELECT COUNT(*) FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": test_name_nested}
+            ).scalar()
+            
+            assert result == 0, "Запись из вложенной транзакции не должна сохраниться после отката"
+            
+            # Проверяем, что запись из внешней транзакции все еще существует
+            result = session.execute(
+                text(f"""
+                    SELECT description FROM {schema_name}.session_test_entity
+                    WHERE name = :name
+                """),
+                {"name": test_name_outer}
+            ).scalar()
+            
+            assert result == "Запись из внешней транзакции", "Запись из внешней транзакции должна сохраниться"
+            
+            # Коммитим внешнюю транзакцию
+            session.commit()
+            
+            # Проверяем, что запись из внешней транзакции сохранилась в базе
+            session2 = session_factory()
             try:
-                # Начинаем внешнюю транзакцию
-                session.begin()
-                
-                # Вставляем первую запись во внешней транзакции
-                session.execute(
-                    text(f"""
-                        INSERT INTO {schema_name}.session_test_entity (name, description)
-                        VALUES (:name, :description)
-                    """),
-                    {"name": test_name_outer, "description": "Запись из внешней транзакции"}
-                )
-                
-                # Начинаем вложенную транзакцию (SAVEPOINT)
-                nested = begin_nested_transaction(session)
-                
-                # Вставляем запись во вложенной транзакции
-                session.execute(
+                result = session2.execute(
                     text(f"""
-                        INSERT INTO {schema_name}.session_test_entity (name, description)
-                        VALUES (:name, :description)
+                        SELECT COUNT(*) FROM {schema_name}.session_test_entity
+                        WHERE name = :name
                     """),
-                    {"name": test_name_nested, "description": "Запись из вложенной транзакции"}
-                )
+                    {"name": test_name_outer}
+                ).scalar()
                 
-                # Откатываем вложенную транзакцию
-                nested.rollback()
+                assert result == 1, "Запись из внешней транзакции должна сохраниться после коммита"
                 
                 # Проверяем, что запись из вложенной транзакции не сохранилась
-                result = session.execute(
+                result = session2.execute(
                     text(f"""
                         SELECT COUNT(*) FROM {schema_name}.session_test_entity
                         WHERE name = :name
@@ -667,57 +657,8 @@ class TestSessionIntegration:
                 ).scalar()
                 
                 assert result == 0, "Запись из вложенной транзакции не должна сохраниться после отката"
-                
-                # Проверяем, что запись из внешней транзакции все еще существует
-                result = session.execute(
-                    text(f"""
-                        SELECT description FROM {schema_name}.session_test_entity
-                        WHERE name = :name
-                    """),
-                    {"name": test_name_outer}
-                ).scalar()
-                
-                assert result == "Запись из внешней транзакции", "Запись из внешней транзакции должна сохраниться"
-                
-                # Коммитим внешнюю транзакцию
-                session.commit()
-                
-                # Проверяем, что запись из внешней транзакции сохранилась в базе
-                session2 = session_factory()
-                try:
-                    result = session2.execute(
-                        text(f"""
-                            SELECT COUNT(*) FROM {schema_name}.session_test_entity
-                            WHERE name = :name
-                        """),
-                        {"name": test_name_outer}
-                    ).scalar()
-                    
-                    assert result == 1, "Запись из внешней транзакции должна сохраниться после коммита"
-                    
-                    # Проверяем, что запись из вложенной транзакции не сохранилась
-                    result = session2.execute(
-                        text(f"""
-                            SELECT COUNT(*) FROM {schema_name}.session_test_entity
-                            WHERE name = :name
-                        """),
-                        {"name": test_name_nested}
-                    ).scalar()
-                    
-                    assert result == 0, "Запись из вложенной транзакции не должна сохраниться после отката"
-                finally:
-                    session2.close()
-                
             finally:
-                session.close()
-                
+                session2.close()
+            
         finally:
-            # Очищаем тестовые данные
-            with session_scope(session_factory) as session:
-                session.execute(
-                    text(f"""
-                        DELETE FROM {schema_name}.session_test_entity 
-                        WHERE name IN (:name1, :name2)
-                    """),
-                    {"name1": test_name_outer, "name2": test_name_nested}
-                )
\ No newline at end of file
+            session.close()
@@ -8,10 +8,11 @@
 
 import logging
 import pytest
-from sqlalchemy import Column, Integer, String, Table, text
+from sqlalchemy import Column, Integer, String, Table, text, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.exc import SQLAlchemyError, InvalidRequestError
 from sqlalchemy.orm.exc import DetachedInstanceError
+from sqlalchemy.pool import NullPool
 
 from undermaind.core.engine import create_db_engine
 from undermaind.core.session import (
@@ -30,8 +31,9 @@ logger = logging.getLogger(__name__)
 class MemoryTestEntity(Base):
     """Тестовая модель для проверки функций сохранения памяти."""
     __tablename__ = "memory_test_entity"
-    # Явно устанавливаем схему для модели, чтобы избежать использования "memory"
-    __table_args__ = {'schema': 'ami_test_user'}
+    # Явно устанавливаем схему для модели, чтобы избежать использования "memory".
+    # Данные тестов не нужны после сбоя сервера, поэтому таблица не пишется в WAL
+    __table_args__ = {'schema': 'ami_test_user', 'prefixes': ['UNLOGGED']}
     
     id = Column(Integer, primary_key=True)
     name = Column(String(50), nullable=False)
@@ -50,51 +52,37 @@ def ensure_memory_test_table(test_engine_postgres, test_ami_initializer, db_conf
     подключения с административными правами.
     """
     # Получаем схему из конфигурации тестов
-    schema = db_config["DB_SCHEMA"]
+    schema = db_config.schema
     
-    # Используем метод AmiInitializer для создания административного подключения
-    with test_ami_initializer._get_db_connection() as conn:
-        conn.autocommit = True
-        with conn.cursor() as cur:
-            # Проверяем, существует ли уже таблица
-            cur.execute(
-                f"SELECT EXISTS (SELECT FROM information_schema.tables "
-                f"WHERE table_schema = %s AND table_name = %s)",
-                (schema, 'memory_test_entity')
-            )
-            table_exists = cur.fetchone()[0]
-            
-            if not table_exists:
-                # Создаем таблицу с правами администратора
-                cur.execute(f"""
-                    CREATE TABLE {schema}.memory_test_entity (
-                        id SERIAL PRIMARY KEY,
-                        name VARCHAR(50) NOT NULL,
-                        content VARCHAR(200),
-                        memory_level INTEGER DEFAULT 1
-                    )
-                """)
-                
-                # Предоставляем права АМИ-пользователю
-                cur.execute(f"""
-                    GRANT ALL PRIVILEGES ON TABLE {schema}.memory_test_entity TO {schema}
-                """)
-                
-                # Предоставляем права на последовательность
-                cur.execute(f"""
-                    GRANT USAGE, SELECT ON SEQUENCE {schema}.memory_test_entity_id_seq TO {schema}
-                """)
-                
-                logger.info(f"Таблица {schema}.memory_test_entity создана для тестирования")
+    # Административный движок поверх подключения AmiInitializer
+    admin_engine = create_engine(
+        "postgresql://",
+        creator=test_ami_initializer._get_db_connection,
+        poolclass=NullPool
+    )
+    # Модель объявлена со схемой ami_test_user, фактическая схема берется из конфигурации
+    schema_map = {"ami_test_user": schema}
+    
+    with admin_engine.begin() as conn:
+        conn = conn.execution_options(schema_translate_map=schema_map)
+        # DDL строится компилятором SQLAlchemy; таблица создается, только если ее нет
+        MemoryTestEntity.__table__.create(conn, checkfirst=True)
+        
+        # Предоставляем права АМИ-пользователю на таблицу и последовательность
+        # одним пакетом, без лишнего обмена с сервером
+        conn.exec_driver_sql(
+            f"GRANT ALL PRIVILEGES ON TABLE {schema}.memory_test_entity TO {schema}; "
+            f"GRANT USAGE, SELECT ON SEQUENCE {schema}.memory_test_entity_id_seq TO {schema}"
+        )
+        logger.info(f"Таблица {schema}.memory_test_entity готова для тестирования")
     
     yield
     
     # Очищаем таблицу после тестов
-    with test_ami_initializer._get_db_connection() as conn:
-        conn.autocommit = True
-        with conn.cursor() as cur:
-            cur.execute(f"TRUNCATE TABLE {schema}.memory_test_entity RESTART IDENTITY CASCADE")
-            logger.info(f"Таблица {schema}.memory_test_entity очищена после тестов")
+    with admin_engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE TABLE {schema}.memory_test_entity RESTART IDENTITY CASCADE"))
+        logger.info(f"Таблица {schema}.memory_test_entity очищена после тестов")
+    admin_engine.dispose()
 
 
 @pytest.fixture(scope="module")
@@ -247,16 +235,19 @@ class TestMemoryPreservation:
         with session_scope(test_session_factory) as session:
             session.query(MemoryTestEntity).filter_by(id=entity_id).delete()
     
-    def test_service_session_manager_init(self, test_engine_postgres):
+    def test_service_session_manager_init(self, test_engine_memory):
         """
         Проверяет инициализацию ServiceSessionManager.
         
         ServiceSessionManager - это специализированный менеджер сессий,
         оптимизированный для сервисного слоя с настройками, предотвращающими
         эфемерность объектов.
+        
+        Тест проверяет только настройки менеджера и не обращается к базе,
+        поэтому использует SQLite в памяти вместо PostgreSQL.
         """
         # Создаем ServiceSessionManager с настройками по умолчанию
-        manager = ServiceSessionManager(engine=test_engine_postgres)
+        manager = ServiceSessionManager(engine=test_engine_memory)
         
         # Проверяем, что настройки корректно установлены
         assert manager.expire_on_commit is False, "ServiceSessionManager должен иметь expire_on_commit=False по умолчанию"
@@ -268,7 +259,7 @@ class TestMemoryPreservation:
         session = manager.get_session()
         try:
             # Проверяем, что сессия правильного типа и правильно настроена
-            assert session.bind == test_engine_postgres, "Сессия должна быть привязана к правильному движку"
+            assert session.bind == test_engine_memory, "Сессия должна быть привязана к правильному движку"
         finally:
             session.close()
     
@@ -46,7 +46,7 @@ class TestExperience:
         assert experience.id is not None, "Опыт должен получить ID при сохранении в БД"
         
         # Получаем запись из БД для проверки
-        db_experience = db_session_postgres.query(Experience).filter_by(id=experience.id).first()
+        db_experience = db_session_postgres.get(Experience, experience.id)
         assert db_experience is not None, "Опыт должен существовать в БД после сохранения"
         assert db_experience.content == "Тестовый опыт", "Содержание должно соответствовать заданному"
         assert db_experience.information_category == Experience.CATEGORY_SELF, "Категория должна соответствовать заданной"
@@ -79,7 +79,7 @@ class TestExperience:
         db_session_postgres.commit()
         
         # Получаем обновленную запись из БД для проверки
-        updated_experience = db_session_postgres.query(Experience).filter_by(id=experience.id).first()
+        updated_experience = db_session_postgres.get(Experience, experience.id)
         assert updated_experience.content == "Обновленное содержание", "Содержание должно быть обновлено"
         assert updated_experience.salience == 8, "Значимость должна быть обновлена"
         assert updated_experience.verified_status, "Статус верификации должен быть обновлен"
@@ -162,15 +162,15 @@ class TestExperience:
         db_session_postgres.commit()
 
         # Загружаем опыты из БД для проверки
-        db_parent = db_session_postgres.query(Experience).filter_by(id=parent_experience.id).first()
-        db_child = db_session_postgres.query(Experience).filter_by(id=child_experience.id).first()
+        db_parent = db_session_postgres.get(Experience, parent_experience.id)
+        db_child = db_session_postgres.get(Experience, child_experience.id)
 
         # Проверяем связи
         assert db_parent.child_experiences[0].id == db_child.id, "Дочерний опыт должен быть связан с родительским"
         assert db_child.parent_experience.id == db_parent.id, "Родительский опыт должен быть связан с дочерним"
 
     @pytest.mark.skipif(not HAS_PGVECTOR, reason="Требуется pgvector")
-    def test_content_vector(self, db_session_postgres):
+    def test_content_vector(self, db_session_postgres, pgvector_ready):
         """Проверяет работу с векторным представлением содержания."""
         # Создаем опыт
         experience = Experience(
@@ -188,7 +188,7 @@ class TestExperience:
         db_session_postgres.commit()
         
         # Получаем обновленный опыт из БД
-        updated_experience = db_session_postgres.query(Experience).filter_by(id=experience.id).first()
+        updated_experience = db_session_postgres.get(Experience, experience.id)
         assert updated_experience.content_vector is not None, "Векторное представление должно быть установлено"
         
         # Устанавливаем вектор (list)
@@ -197,7 +197,7 @@ class TestExperience:
         db_session_postgres.commit()
         
         # Получаем обновленный опыт из БД
-        updated_experience = db_session_postgres.query(Experience).filter_by(id=experience.id).first()
+        updated_experience = db_session_postgres.get(Experience, experience.id)
         assert updated_experience.content_vector is not None, "Векторное представление должно быть установлено"
 
     def test_create_class_method(self, db_session_postgres):
@@ -46,7 +46,7 @@ class TestExperienceAttribute:
         assert attribute.id is not None, "Атрибут должен получить ID при сохранении в БД"
         
         # Получаем запись из БД для проверки
-        db_attribute = db_session_postgres.query(ExperienceAttribute).filter_by(id=attribute.id).first()
+        db_attribute = db_session_postgres.get(ExperienceAttribute, attribute.id)
         assert db_attribute is not None, "Атрибут должен существовать в БД после сохранения"
         assert db_attribute.attribute_name == "test_attribute", "Название атрибута должно соответствовать заданному"
         assert db_attribute.attribute_value == "test_value", "Значение атрибута должно соответствовать заданному"
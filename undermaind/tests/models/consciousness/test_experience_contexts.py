@@ -43,7 +43,7 @@ class TestExperienceContext:
         assert context.id is not None, "Контекст опыта должен получить ID при сохранении в БД"
         
         # Получаем запись из БД для проверки
-        db_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        db_context = db_session_postgres.get(ExperienceContext, context.id)
         assert db_context is not None, "Контекст опыта должен существовать в БД после сохранения"
         assert db_context.title == "Тестовый разговор", "Заголовок контекста должен соответствовать заданному"
         assert db_context.context_type == ExperienceContext.CONTEXT_TYPE_CONVERSATION, "Тип контекста должен соответствовать заданному"
@@ -71,7 +71,7 @@ class TestExperienceContext:
         db_session_postgres.commit()
         
         # Получаем обновленную запись из БД для проверки
-        updated_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        updated_context = db_session_postgres.get(ExperienceContext, context.id)
         assert updated_context.title == "Обновленный заголовок", "Заголовок должен быть обновлен"
         assert updated_context.summary == "Обновленное описание", "Описание должно быть обновлено"
         assert "updated" in updated_context.tags, "Тег должен быть добавлен"
@@ -94,7 +94,7 @@ class TestExperienceContext:
         db_session_postgres.commit()
         
         # Получаем обновленную запись из БД для проверки
-        closed_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        closed_context = db_session_postgres.get(ExperienceContext, context.id)
         assert not closed_context.active_status, "Контекст должен быть закрыт (неактивен)"
         assert closed_context.closed_at is not None, "Должна быть установлена дата закрытия"
     
@@ -127,7 +127,7 @@ class TestExperienceContext:
         assert child_context.parent_context.title == "Родительский контекст", "Заголовок родительского контекста должен быть доступен"
         
         # Проверяем связь от родительского к дочернему
-        refreshed_parent = db_session_postgres.query(ExperienceContext).filter_by(id=parent_context.id).first()
+        refreshed_parent = db_session_postgres.get(ExperienceContext, parent_context.id)
         assert len(refreshed_parent.child_contexts) > 0, "У родительского контекста должен быть минимум один дочерний контекст"
         assert refreshed_parent.child_contexts[0].id == child_context.id, "Дочерний контекст должен быть в списке дочерних"
     
@@ -159,14 +159,14 @@ class TestExperienceContext:
         db_session_postgres.commit()
         
         # Получаем обновленный контекст из БД
-        updated_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        updated_context = db_session_postgres.get(ExperienceContext, context.id)
         assert source.id in updated_context.participants, "ID участника должен быть в списке участников контекста"
         
         # Проверяем, что добавление того же участника второй раз не дублирует его
         context.add_participant(source.id)
         db_session_postgres.commit()
         
-        updated_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        updated_context = db_session_postgres.get(ExperienceContext, context.id)
         assert updated_context.participants.count(source.id) == 1, "Участник не должен дублироваться в списке"
     
     def test_add_related_context(self, db_session_postgres):
@@ -213,7 +213,7 @@ class TestExperienceContext:
         db_session_postgres.commit()
         
         # Получаем обновленный контекст из БД
-        updated_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        updated_context = db_session_postgres.get(ExperienceContext, context.id)
         assert "important" in updated_context.tags, "Тег должен быть добавлен"
         assert "urgent" in updated_context.tags, "Тег должен быть добавлен"
         
@@ -221,11 +221,11 @@ class TestExperienceContext:
         context.add_tag("important")
         db_session_postgres.commit()
         
-        updated_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        updated_context = db_session_postgres.get(ExperienceContext, context.id)
         assert updated_context.tags.count("important") == 1, "Тег не должен дублироваться в списке"
     
     @pytest.mark.skipif(not HAS_PGVECTOR, reason="Требуется pgvector")
-    def test_set_summary_vector(self, db_session_postgres):
+    def test_set_summary_vector(self, db_session_postgres, pgvector_ready):
         """Проверяет установку векторного представления для резюме контекста."""
         # Создаем контекст
         context = ExperienceContext(
@@ -244,7 +244,7 @@ class TestExperienceContext:
         db_session_postgres.commit()
         
         # Получаем обновленный контекст из БД
-        updated_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        updated_context = db_session_postgres.get(ExperienceContext, context.id)
         assert updated_context.summary_vector is not None, "Векторное представление должно быть установлено"
         
         # Устанавливаем вектор (list)
@@ -253,7 +253,7 @@ class TestExperienceContext:
         db_session_postgres.commit()
         
         # Получаем обновленный контекст из БД
-        updated_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        updated_context = db_session_postgres.get(ExperienceContext, context.id)
         assert updated_context.summary_vector is not None, "Векторное представление должно быть установлено"
     
     def test_to_dict_method(self, db_session_postgres):
@@ -382,7 +382,7 @@ class TestExperienceContext:
         db_session_postgres.commit()
         
         # Получаем обновленный контекст из БД
-        updated_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        updated_context = db_session_postgres.get(ExperienceContext, context.id)
         assert updated_context.title == "Updated Title", "Заголовок должен быть обновлен"
         assert updated_context.summary == "Updated summary", "Описание должно быть обновлено"
         assert not updated_context.active_status, "Статус активности должен быть обновлен"
\ No newline at end of file
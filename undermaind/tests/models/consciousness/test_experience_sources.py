@@ -40,7 +40,7 @@ class TestExperienceSource:
         assert source.id is not None, "Источник опыта должен получить ID при сохранении в БД"
         
         # Получаем запись из БД для проверки
-        db_source = db_session_postgres.query(ExperienceSource).filter_by(id=source.id).first()
+        db_source = db_session_postgres.get(ExperienceSource, source.id)
         assert db_source is not None, "Источник опыта должен существовать в БД после сохранения"
         assert db_source.name == "Test Human User", "Имя источника должно соответствовать заданному"
         assert db_source.source_type == ExperienceSource.SOURCE_TYPE_HUMAN, "Тип источника должен соответствовать заданному"
@@ -70,7 +70,7 @@ class TestExperienceSource:
         db_session_postgres.commit()
         
         # Получаем обновленную запись из БД для проверки
-        updated_source = db_session_postgres.query(ExperienceSource).filter_by(id=source.id).first()
+        updated_source = db_session_postgres.get(ExperienceSource, source.id)
         assert updated_source.name == "Updated Name", "Имя должно быть обновлено"
         assert updated_source.description == "Обновленное описание", "Описание должно быть обновлено"
         assert updated_source.agency_level == 3, "Уровень агентивности должен быть обновлен"
@@ -97,7 +97,7 @@ class TestExperienceSource:
         db_session_postgres.commit()
         
         # Проверяем, что запись удалена
-        deleted_source = db_session_postgres.query(ExperienceSource).filter_by(id=source_id).first()
+        deleted_source = db_session_postgres.get(ExperienceSource, source_id)
         assert deleted_source is None, "Источник опыта должен быть удален из БД"
     
     def test_get_or_create_unknown_source(self, db_session_postgres):
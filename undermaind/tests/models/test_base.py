@@ -8,14 +8,10 @@ and its configuration for using the ami_memory schema.
 import pytest
 from sqlalchemy import inspect
 import os
-import dotenv
 
 from undermaind.models.base import Base as ModelsBase
-from undermaind.core.base import Base as CoreBase
-
-# Load test configuration
-test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.env')
-dotenv.load_dotenv(test_config_path)
+from undermaind.config import Config
+from undermaind.core.base import Base as CoreBase, create_base
 
 def test_base_import_from_core():
     """Checks that Base in models/base.py is the same object as in core/base.py."""
@@ -41,6 +37,20 @@ def test_models_base_schema():
     assert 'ck' in naming_convention, "Naming convention for check constraint is missing"
 
 
+
+def test_create_base_schema_from_config():
+    """Checks that create_base takes the schema from the Config.schema field."""
+    config = Config(
+        db_host="localhost", db_port=5432, db_name="family_db",
+        admin_user="admin", admin_password="secret",
+        ami_name="ami", ami_password="ami_secret", schema="ami_schema"
+    )
+    
+    base = create_base(auto_create_schema=False, config=config)
+    
+    assert base.metadata.schema == "ami_schema"
+
+
 def test_models_base_export():
     """Checks correct export of Base from models/base.py."""
     # Import to verify that Base is available through this import
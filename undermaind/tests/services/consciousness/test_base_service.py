@@ -44,7 +44,7 @@ class TestBaseService:
         assert session == mock_session, "Метод должен вернуть сессию из менеджера"
         mock_manager.get_session.assert_called_once(), "Метод должен вызвать get_session у менеджера"
     
-    def test_execute_in_transaction_success(self, db_session_postgres):
+    def test_execute_in_transaction_success(self, db_session_postgres, session_manager_postgres):
         """Проверка выполнения операции в транзакции (успешный случай)."""
         # Создаем временную функцию для теста
         def test_func(session, arg1, kwarg1=None):
@@ -59,8 +59,8 @@ class TestBaseService:
             session.flush()
             return exp
         
-        # Создаем сервис
-        service = BaseService()
+        # Создаем сервис на соединении теста, чтобы запись была видна db_session_postgres
+        service = BaseService(session_manager=session_manager_postgres)
         
         # Выполняем функцию в транзакции
         result = service._execute_in_transaction(test_func, "arg_value", kwarg1="kwarg_value")
@@ -71,7 +71,7 @@ class TestBaseService:
         assert result.content == "Test content: arg_value, kwarg_value", "Содержимое должно соответствовать параметрам"
         
         # Проверяем, что запись сохранена в БД
-        saved_exp = db_session_postgres.query(Experience).filter_by(id=result.id).first()
+        saved_exp = db_session_postgres.get(Experience, result.id)
         assert saved_exp is not None, "Запись должна быть сохранена в БД"
     
     def test_execute_in_transaction_error(self):
@@ -89,7 +89,7 @@ class TestBaseService:
         
         assert "Test database error" in str(excinfo.value), "Должна пробрасываться ошибка SQLAlchemyError"
     
-    def test_execute_in_isolated_transaction(self, db_session_postgres):
+    def test_execute_in_isolated_transaction(self, db_session_postgres, session_manager_postgres):
         """Проверка выполнения операции в изолированной транзакции."""
         # Создаем временную функцию для теста
         def test_func(session, arg1):
@@ -104,8 +104,8 @@ class TestBaseService:
             session.flush()
             return exp
         
-        # Создаем сервис
-        service = BaseService()
+        # Создаем сервис на соединении теста, чтобы запись была видна db_session_postgres
+        service = BaseService(session_manager=session_manager_postgres)
         
         # Выполняем функцию в изолированной транзакции
         result = service._execute_in_isolated_transaction(test_func, isolation_level="SERIALIZABLE", arg1="test_value")
@@ -116,7 +116,7 @@ class TestBaseService:
         assert result.content == "Test isolated transaction: test_value", "Содержимое должно соответствовать параметрам"
         
         # Проверяем, что запись сохранена в БД
-        saved_exp = db_session_postgres.query(Experience).filter_by(id=result.id).first()
+        saved_exp = db_session_postgres.get(Experience, result.id)
         assert saved_exp is not None, "Запись должна быть сохранена в БД"
     
     def test_begin_nested(self):
@@ -29,9 +29,9 @@ class TestExperienceProcessingService:
     """Тесты для сервиса обработки опыта."""
     
     @pytest.fixture
-    def service(self):
-        """Фикстура, создающая экземпляр сервиса для тестов."""
-        return ExperienceProcessingService()
+    def service(self, session_manager_postgres):
+        """Фикстура, создающая экземпляр сервиса на соединении теста."""
+        return ExperienceProcessingService(session_manager=session_manager_postgres)
     
     @pytest.fixture
     def context(self, db_session_postgres):
@@ -485,7 +485,7 @@ class TestExperienceProcessingService:
         assert updated.subjective_position == Experience.POSITION_OBSERVER, "Позиция должна быть обновлена"
         
         # Подтверждаем сохранение в БД
-        db_exp = db_session_postgres.query(Experience).filter_by(id=experience.id).first()
+        db_exp = db_session_postgres.get(Experience, experience.id)
         assert db_exp.content == "Обновленный опыт", "Обновленное содержание должно быть сохранено в БД"
         
         # Проверяем ошибку при несуществующем опыте
@@ -536,5 +536,5 @@ class TestExperienceProcessingService:
         assert activated.active_status is True, "Контекст должен быть активирован"
         
         # Проверяем состояние в БД
-        db_context = db_session_postgres.query(ExperienceContext).filter_by(id=context.id).first()
+        db_context = db_session_postgres.get(ExperienceContext, context.id)
         assert db_context.active_status is True, "Контекст должен быть активирован в БД"
\ No newline at end of file
@@ -6,10 +6,13 @@
 анализ сети связей и контекстную группировку опытов.
 """
 
+import random
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
+from sqlalchemy import func, select, union_all
+
 from undermaind.services.consciousness.memory_network_service import (
     MemoryNetworkService,
     ConnectionNotFoundError,
@@ -22,14 +25,79 @@ from undermaind.models.consciousness import (
 )
 
 
+def _dfs_clusters(edges, min_connections):
+    """
+    Эталонный поиск кластеров обходом в глубину по списку связей.
+
+    Повторяет прежнюю реализацию find_clusters_in_network; результат
+    нормализован так же, как у сервиса: ID и кластеры отсортированы.
+    """
+    counts = {}
+    for source_id, target_id in edges:
+        counts[source_id] = counts.get(source_id, 0) + 1
+        counts[target_id] = counts.get(target_id, 0) + 1
+    hubs = {exp_id for exp_id, count in counts.items() if count >= min_connections}
+
+    graph = {exp_id: set() for exp_id in hubs}
+    for source_id, target_id in edges:
+        if source_id in hubs and target_id in hubs:
+            graph[source_id].add(target_id)
+            graph[target_id].add(source_id)
+
+    visited = set()
+    clusters = []
+    for exp_id in hubs:
+        if exp_id in visited:
+            continue
+        cluster = []
+        stack = [exp_id]
+        while stack:
+            current = stack.pop()
+            if current not in visited:
+                visited.add(current)
+                cluster.append(current)
+                stack.extend(graph[current] - visited)
+        clusters.append(sorted(cluster))
+    return sorted(clusters)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("min_connections", [1, 2, 3])
+def test_group_into_clusters_matches_dfs(seed, min_connections):
+    """Кластеры системы непересекающихся множеств совпадают с обходом в глубину."""
+    rng = random.Random(seed)
+    experience_ids = rng.sample(range(1, 1000), 15)
+    edges = [tuple(rng.sample(experience_ids, 2)) for _ in range(rng.randint(0, 30))]
+    
+    counts = {}
+    for source_id, target_id in edges:
+        counts[source_id] = counts.get(source_id, 0) + 1
+        counts[target_id] = counts.get(target_id, 0) + 1
+    hubs = [exp_id for exp_id, count in counts.items() if count >= min_connections]
+    
+    clusters = MemoryNetworkService._group_into_clusters(hubs, edges)
+    
+    assert clusters == _dfs_clusters(edges, min_connections)
+
+
+def test_group_into_clusters_ordering_and_non_hub_edges():
+    """ID в кластере и сами кластеры упорядочены, связи через не-хабы не объединяют кластеры."""
+    # 7 связан с 3 и 9 только через 5, который хабом не является
+    edges = [(9, 7), (7, 5), (5, 3), (3, 8)]
+    
+    assert MemoryNetworkService._group_into_clusters([9, 7, 8, 3], edges) == [[3, 8], [7, 9]]
+    assert MemoryNetworkService._group_into_clusters([4], []) == [[4]]
+    assert MemoryNetworkService._group_into_clusters([], edges) == []
+
+
 @pytest.mark.integration
 class TestMemoryNetworkService:
     """Тесты для сервиса управления сетью связей."""
     
     @pytest.fixture
-    def service(self):
-        """Фикстура, создающая экземпляр сервиса для тестов."""
-        return MemoryNetworkService()
+    def service(self, session_manager_postgres):
+        """Фикстура, создающая экземпляр сервиса на соединении теста."""
+        return MemoryNetworkService(session_manager=session_manager_postgres)
     
     @pytest.fixture
     def context(self, db_session_postgres):
@@ -144,7 +212,7 @@ class TestMemoryNetworkService:
         assert updated_connection.activation_count > initial_activations, "Счетчик активаций должен быть увеличен"
         
         # Проверяем состояние в БД
-        db_connection = db_session_postgres.query(ExperienceConnection).filter_by(id=connection_id).first()
+        db_connection = db_session_postgres.get(ExperienceConnection, connection_id)
         assert db_connection.strength == 8, "Сила связи должна быть обновлена в БД"
     
     def test_get_connection(self, service, experiences, db_session_postgres):
@@ -193,7 +261,7 @@ class TestMemoryNetworkService:
         assert updated.activation_count > initial_activations, "Счетчик активаций должен быть увеличен"
         
         # Проверяем состояние в БД
-        db_connection = db_session_postgres.query(ExperienceConnection).filter_by(id=connection.id).first()
+        db_connection = db_session_postgres.get(ExperienceConnection, connection.id)
         assert db_connection.strength == 9, "Сила связи должна быть обновлена в БД"
         
         # Проверяем валидацию значения
@@ -234,7 +302,7 @@ class TestMemoryNetworkService:
         assert activated.last_activated > initial_timestamp, "Время последней активации должно быть обновлено"
         
         # Проверяем состояние в БД
-        db_connection = db_session_postgres.query(ExperienceConnection).filter_by(id=connection.id).first()
+        db_connection = db_session_postgres.get(ExperienceConnection, connection.id)
         assert db_connection.activation_count > initial_activations, "Счетчик активаций должен быть увеличен в БД"
     
     def test_find_connected_experiences(self, service, experiences, db_session_postgres):
@@ -602,6 +670,70 @@ class TestMemoryNetworkService:
         assert all(c.connection_type == ExperienceConnection.TYPE_TEMPORAL for c in connections), \
             "Все связи должны иметь тип TYPE_TEMPORAL"
     
+    def test_strengthen_connections_by_cooccurrence_upsert(self, service, db_session_postgres, context):
+        """Проверка вставки новых и усиления существующих связей одним запросом."""
+        base_time = datetime.now()
+        
+        exps = [
+            Experience(
+                content=f"Опыт {i} для проверки усиления",
+                experience_type=Experience.TYPE_THOUGHT,
+                information_category=Experience.CATEGORY_SELF,
+                subjective_position=Experience.POSITION_REFLECTIVE,
+                context_id=context.id,
+                timestamp=base_time + timedelta(seconds=10 * i)
+            )
+            for i in range(3)
+        ]
+        db_session_postgres.add_all(exps)
+        db_session_postgres.commit()
+        first, second, third = sorted(exps, key=lambda exp: exp.id)
+        
+        # Существующая связь средней силы и связь, уже достигшая максимума
+        medium = ExperienceConnection(
+            source_experience_id=first.id,
+            target_experience_id=second.id,
+            connection_type=ExperienceConnection.TYPE_TEMPORAL,
+            strength=5
+        )
+        saturated = ExperienceConnection(
+            source_experience_id=first.id,
+            target_experience_id=third.id,
+            connection_type=ExperienceConnection.TYPE_TEMPORAL,
+            strength=10
+        )
+        db_session_postgres.add_all([medium, saturated])
+        db_session_postgres.commit()
+        medium_count = medium.activation_count
+        
+        # Целое min_strength_increase: прирост не должен делиться нацело
+        updated_count = service.strengthen_connections_by_cooccurrence(
+            context.id,
+            time_window_seconds=120,
+            min_strength_increase=1
+        )
+        
+        # Учитываются вставленная связь и усиленная, но не связь с силой 10
+        assert updated_count == 2, "Должны быть учтены одна новая и одна усиленная связь"
+        
+        db_session_postgres.expire_all()
+        
+        # 5 + max(1, 10 - 5) / 2 = 7.5, округляется до 8
+        medium = db_session_postgres.get(ExperienceConnection, medium.id)
+        assert medium.strength == 8, "Сила связи должна вырасти с 5 до 8"
+        assert medium.activation_count == medium_count + 1, "Счетчик активаций должен увеличиться"
+        
+        saturated = db_session_postgres.get(ExperienceConnection, saturated.id)
+        assert saturated.strength == 10, "Сила связи не должна превышать 10"
+        
+        created = db_session_postgres.query(ExperienceConnection).filter_by(
+            source_experience_id=second.id,
+            target_experience_id=third.id,
+            connection_type=ExperienceConnection.TYPE_TEMPORAL
+        ).one()
+        assert created.strength == 3, "Новая связь создается с начальной силой 3"
+        assert created.direction == ExperienceConnection.DIRECTION_BI, "Новая связь должна быть двунаправленной"
+    
     def test_find_clusters_in_network(self, service, db_session_postgres):
         """Проверка поиска кластеров в сети связей."""
         # Создаем два набора опытов с внутренними связями
@@ -697,6 +829,144 @@ class TestMemoryNetworkService:
                 
         assert not isolated_in_cluster, "Изолированный опыт не должен быть в кластерах"
     
+    def test_find_clusters_in_network_matches_dfs(self, service, db_session_postgres):
+        """Проверка, что кластеры совпадают с результатом обхода в глубину."""
+        exps = [
+            Experience(
+                content=f"Опыт сети {i}",
+                experience_type=Experience.TYPE_THOUGHT,
+                information_category=Experience.CATEGORY_SELF,
+                subjective_position=Experience.POSITION_REFLECTIVE
+            )
+            for i in range(8)
+        ]
+        db_session_postgres.add_all(exps)
+        db_session_postgres.commit()
+        a0, a1, a2, a3, b0, b1, c0, c1 = [exp.id for exp in exps]
+        
+        # Треугольник a0-a1-a2 с «хвостом» a3, пара b0-b1 с двумя типами связей
+        # и одиночная связь c0-c1
+        edges = [
+            (a0, a1, ExperienceConnection.TYPE_SEMANTIC),
+            (a1, a2, ExperienceConnection.TYPE_SEMANTIC),
+            (a2, a0, ExperienceConnection.TYPE_SEMANTIC),
+            (a0, a3, ExperienceConnection.TYPE_ASSOCIATION),
+            (b0, b1, ExperienceConnection.TYPE_SEMANTIC),
+            (b1, b0, ExperienceConnection.TYPE_TEMPORAL),
+            (c0, c1, ExperienceConnection.TYPE_SEMANTIC),
+        ]
+        db_session_postgres.add_all([
+            ExperienceConnection(
+                source_experience_id=source_id,
+                target_experience_id=target_id,
+                connection_type=connection_type,
+                strength=5
+            )
+            for source_id, target_id, connection_type in edges
+        ])
+        db_session_postgres.commit()
+        
+        pairs = [(source_id, target_id) for source_id, target_id, _ in edges]
+        
+        clusters = service.find_clusters_in_network(min_connections=2)
+        assert clusters == _dfs_clusters(pairs, 2), "Кластеры должны совпадать с обходом в глубину"
+        assert clusters == sorted([sorted([a0, a1, a2]), sorted([b0, b1])]), \
+            "Опыты с одной связью (a3, c0, c1) не должны попадать в кластеры"
+        
+        # С более строгим порогом в сети остается только a0
+        clusters = service.find_clusters_in_network(min_connections=3)
+        assert clusters == _dfs_clusters(pairs, 3), "Кластеры должны совпадать с обходом в глубину"
+        assert clusters == [[a0]], "При пороге 3 кластером должен остаться только a0"
+        
+        # Порог выше любой степени не оставляет кластеров
+        assert service.find_clusters_in_network(min_connections=4) == []
+    
+    def test_find_clusters_in_network_without_hubs(self, service, db_session_postgres):
+        """Проверка досрочного выхода, когда в сети нет опытов-хабов."""
+        exps = [
+            Experience(
+                content=f"Слабо связанный опыт {i}",
+                experience_type=Experience.TYPE_THOUGHT,
+                information_category=Experience.CATEGORY_SELF,
+                subjective_position=Experience.POSITION_REFLECTIVE
+            )
+            for i in range(3)
+        ]
+        db_session_postgres.add_all(exps)
+        db_session_postgres.commit()
+        
+        db_session_postgres.add(ExperienceConnection(
+            source_experience_id=exps[0].id,
+            target_experience_id=exps[1].id,
+            connection_type=ExperienceConnection.TYPE_SEMANTIC,
+            strength=5
+        ))
+        db_session_postgres.commit()
+        exp_ids = {exp.id for exp in exps}
+        
+        # Связи есть, но опыты теста не набирают порог
+        clusters = service.find_clusters_in_network(min_connections=2)
+        assert not any(exp_ids & set(cluster) for cluster in clusters), \
+            "Опыты с одной связью не должны попадать в кластеры"
+        
+        # Порог выше степени любого опыта в сети: хабов нет вовсе,
+        # и сервис возвращает пустой список, не запрашивая связи между хабами
+        endpoints = union_all(
+            select(ExperienceConnection.source_experience_id.label("exp_id")),
+            select(ExperienceConnection.target_experience_id.label("exp_id"))
+        ).subquery()
+        degrees = select(func.count().label("degree")).select_from(endpoints) \
+            .group_by(endpoints.c.exp_id).subquery()
+        max_degree = db_session_postgres.scalar(select(func.max(degrees.c.degree)))
+        
+        assert service.find_clusters_in_network(min_connections=max_degree + 1) == [], \
+            "Без хабов кластеров быть не должно"
+    
+    def test_find_clusters_in_network_with_several_hubs(self, service, db_session_postgres):
+        """Проверка, что кластеры строятся только по связям между хабами."""
+        exps = [
+            Experience(
+                content=f"Опыт со многими связями {i}",
+                experience_type=Experience.TYPE_THOUGHT,
+                information_category=Experience.CATEGORY_SELF,
+                subjective_position=Experience.POSITION_REFLECTIVE
+            )
+            for i in range(9)
+        ]
+        db_session_postgres.add_all(exps)
+        db_session_postgres.commit()
+        h1, h2, h3, x1, x2, y1, y2, z1, z2 = [exp.id for exp in exps]
+        
+        # h1 и h2 связаны напрямую; h3 связан с h1 только через x1,
+        # который сам хабом не является
+        edges = [
+            (h1, h2), (h1, x1), (h1, x2),
+            (h2, y1), (h2, y2),
+            (h3, x1), (h3, z1), (h3, z2),
+        ]
+        db_session_postgres.add_all([
+            ExperienceConnection(
+                source_experience_id=source_id,
+                target_experience_id=target_id,
+                connection_type=ExperienceConnection.TYPE_ASSOCIATION,
+                strength=5
+            )
+            for source_id, target_id in edges
+        ])
+        db_session_postgres.commit()
+        
+        # В общей схеме АМИ могут быть и другие хабы: проверяем только
+        # кластеры из опытов теста
+        exp_ids = {h1, h2, h3, x1, x2, y1, y2, z1, z2}
+        clusters = [
+            cluster for cluster in service.find_clusters_in_network(min_connections=3)
+            if exp_ids & set(cluster)
+        ]
+        
+        assert clusters == sorted([sorted([h1, h2]), [h3]]), \
+            "Хабы h1 и h2 должны образовать кластер, а h3 остаться отдельно"
+        assert clusters == _dfs_clusters(edges, 3), "Кластеры должны совпадать с обходом в глубину"
+    
     def test_get_connection_types_distribution(self, service, db_session_postgres):
         """Проверка получения распределения типов связей в сети."""
         # Создаем связи разных типов
@@ -121,11 +121,9 @@ class AmiInitializer:
             bool: True если АМИ успешно создан, иначе False
         """
         try:
-            # Проверяем подключение к БД
-            if not self.db_init.check_connection():
-                return False
-
-            # Проверяем существование БД и создаём при необходимости
+            # Проверяем существование БД и создаём при необходимости.
+            # database_exists подключается к серверу и сама сообщает об ошибке
+            # подключения, поэтому отдельная проверка check_connection не нужна
             if not self.db_init.database_exists():
                 logger.info(f"База данных {self.db_init.db_name} не существует, создаём...")
                 if not self.db_init.create_database():